@@ -14,7 +14,7 @@ from .services.command_router import QFarmCommandRouter
 from .services.image_renderer import QFarmImageRenderer
 from .services.process_manager import NodeProcessManager
 from .services.rate_limiter import RateLimiter
-from .services.render_payload_builder import build_qfarm_payload_pages, should_render_qfarm_image
+from .services.render_payload_builder import prepare_qfarm_render
 from .services.state_store import QFarmStateStore
 
 
@@ -155,6 +155,7 @@ class QFarmPlugin(Star):
                 logger.warning(f"[qfarm] 图片渲染服务不可用，将自动回退文本: {render_service_url}")
             self.image_renderer.cleanup_cache()
 
+        self._log_runtime_backends()
         if managed_mode:
             await self.process_manager.start()
         await self._warmup_api()
@@ -186,15 +187,11 @@ class QFarmPlugin(Star):
         replies = await self.router.handle(current_event)
         for reply in replies:
             rendered = False
-            if (
-                reply.text
-                and reply.prefer_image
-                and self.image_renderer is not None
-                and self.state_store is not None
-                and should_render_qfarm_image(reply.text)
-            ):
-                payloads = build_qfarm_payload_pages(reply.text, theme=self.state_store.get_render_theme("light"))
-                if len(payloads) <= 1:
+            if reply.text and reply.prefer_image and self.image_renderer is not None and self.state_store is not None:
+                should_render, payloads = prepare_qfarm_render(
+                    reply.text, theme=self.state_store.get_render_theme("light")
+                )
+                if should_render and len(payloads) <= 1:
                     images: list[str] = []
                     for payload in payloads:
                         image_path = await self.image_renderer.render_qfarm(payload)
@@ -231,6 +228,26 @@ class QFarmPlugin(Star):
             except Exception:
                 await asyncio.sleep(1)
 
+    def _log_runtime_backends(self) -> None:
+        # 事件循环由 AstrBot 宿主创建，插件运行时已无法更换；仅记录当前实现，便于判断宿主是否启用了 uvloop。
+        loop = asyncio.get_running_loop()
+        loop_impl = f"{type(loop).__module__}.{type(loop).__qualname__}"
+        logger.info(f"[qfarm] 事件循环实现: {loop_impl}")
+        # 网关每帧都要 protobuf 编解码，纯 Python 后端会慢一个数量级；protobuf>=4.21 默认即为 upb。
+        try:
+            from google.protobuf.internal import api_implementation
+
+            pb_impl = str(api_implementation.Type())
+        except Exception:
+            pb_impl = "unknown"
+        if pb_impl in ("upb", "cpp"):
+            logger.info(f"[qfarm] protobuf 后端: {pb_impl}")
+        else:
+            logger.warning(
+                f"[qfarm] protobuf 后端为 {pb_impl}，编解码性能较差；"
+                "请确认未设置 PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION=python 且 protobuf 版本满足 requirements.txt"
+            )
+
     def _is_super_admin(self, user_id: str) -> bool:
         return str(user_id or "").strip() in self._super_admin_ids
 
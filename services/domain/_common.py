@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+
+def _to_int(value: Any, default: int = 0) -> int:
+    # 绝大多数输入本身就是 int（JSON 数值 / protobuf 标量），直接返回以跳过 int() 与 try 帧。
+    if type(value) is int:
+        return value
+    try:
+        return int(value)
+    except Exception:
+        return int(default)
+
+
+async def gather_bounded(
+    items: Iterable[_T],
+    fn: Callable[[_T], Awaitable[Any]],
+    limit: int,
+    *,
+    delay_sec: float = 0.0,
+) -> list[Any]:
+    """以至多 limit 路并发对每个元素执行 fn，结果顺序与 items 一致，失败项以异常对象占位。
+
+    delay_sec > 0 时每个并发槽位做完一项后节流等待；队列已空时不再空等。
+    """
+    items = list(items)
+    total = len(items)
+    sem = asyncio.Semaphore(max(1, int(limit)))
+    started = 0
+
+    async def _one(item: _T) -> Any:
+        nonlocal started
+        async with sem:
+            started += 1
+            try:
+                result = await fn(item)
+            except Exception as e:
+                result = e
+            if delay_sec > 0 and started < total:
+                await asyncio.sleep(delay_sec)
+            return result
+
+    return await asyncio.gather(*(_one(item) for item in items))
+
+
+class InflightCalls:
+    """按 key 合并同时在途的只读 RPC，各调用方拿到同一份响应字节。"""
+
+    def __init__(self) -> None:
+        self._tasks: dict[str, asyncio.Task[bytes]] = {}
+
+    async def run(self, key: str, call: Callable[[], Awaitable[bytes]]) -> bytes:
+        # 同一只读 RPC 已在途时直接复用其响应字节（各调用方自行解析，互不共享消息对象）；
+        # 请求结束即移除，不缓存结果，因此先后发生的读取（如出售前后）仍各自发起请求。
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._tasks[key] = task
+            task.add_done_callback(lambda t, k=key: self._drop(k, t))
+        return await asyncio.shield(task)
+
+    def _drop(self, key: str, task: asyncio.Task[bytes]) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception()
@@ -1,16 +1,12 @@
 from __future__ import annotations
 
 import json
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-
-def _to_int(value: Any, default: int = 0) -> int:
-    try:
-        return int(value)
-    except Exception:
-        return int(default)
+from ._common import _to_int
 
 
 @dataclass(slots=True)
@@ -183,12 +179,12 @@ class GameConfigData:
     def _load_role_level(self) -> None:
         path = self.config_dir / "RoleLevel.json"
         self.role_level = self._read_json(path, [])
-        self.level_exp_table = {}
-        for row in self.role_level:
-            level = _to_int(row.get("level"), 0)
-            exp = _to_int(row.get("exp"), 0)
-            if level > 0:
-                self.level_exp_table[level] = exp
+        # 单次推导建表；RoleLevel.json 的 level/exp 原生即为整数，_to_int 仅兜底异常行。
+        self.level_exp_table = {
+            level: _to_int(row.get("exp"), 0)
+            for row in self.role_level
+            if (level := _to_int(row.get("level"), 0)) > 0
+        }
 
     def _load_plants(self) -> None:
         path = self.config_dir / "Plant.json"
@@ -226,26 +222,25 @@ class GameConfigData:
         self.seed_image_by_asset = {}
         if not self.seed_image_dir.exists():
             return
-        for path in self.seed_image_dir.iterdir():
-            if not path.is_file():
-                continue
-            name = path.name
-            url = f"/game-config/seed_images_named/{name}"
-            parts = name.split("_", 1)
-            if parts and parts[0].isdigit():
-                seed_id = int(parts[0])
-                self.seed_image_by_id.setdefault(seed_id, url)
-            if "Crop_" in name and "_Seed" in name:
-                start = name.find("Crop_")
-                end = name.find("_Seed", start)
-                if start >= 0 and end > start:
-                    asset = name[start:end]
-                    self.seed_image_by_asset.setdefault(asset, url)
+        with os.scandir(self.seed_image_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                name = entry.name
+                url = f"/game-config/seed_images_named/{name}"
+                head = name.partition("_")[0]
+                if head.isdigit():
+                    self.seed_image_by_id.setdefault(int(head), url)
+                _, crop, rest = name.partition("Crop_")
+                if crop:
+                    body, seed, _ = rest.partition("_Seed")
+                    if seed:
+                        self.seed_image_by_asset.setdefault(f"Crop_{body}", url)
 
     @staticmethod
     def _read_json(path: Path, default: Any) -> Any:
         try:
-            with path.open("r", encoding="utf-8") as f:
-                return json.load(f)
+            # 直接按字节解析，省去文本解码包装层（json 会自行识别 UTF-8/BOM）。
+            return json.loads(path.read_bytes())
         except Exception:
             return default
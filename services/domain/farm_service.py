@@ -3,10 +3,12 @@ from __future__ import annotations
 import asyncio
 import time
 from dataclasses import dataclass
+from functools import partial
 from typing import Any
 
 from ..protocol.session import GatewaySession
 from ..protocol.proto import plantpb_pb2, shoppb_pb2
+from ._common import _to_int
 from .analytics_service import AnalyticsService
 from .config_data import GameConfigData
 
@@ -21,12 +23,14 @@ PHASE_NAMES = {
     7: "枯萎",
 }
 
-
-def _to_int(value: Any, default: int = 0) -> int:
-    try:
-        return int(value)
-    except Exception:
-        return int(default)
+# 回包类在模块加载时绑定一次，RPC 包装方法内不再逐次穿过 pb2 模块属性查找。
+_AllLandsReply = plantpb_pb2.AllLandsReply
+_HarvestReply = plantpb_pb2.HarvestReply
+_WaterLandReply = plantpb_pb2.WaterLandReply
+_WeedOutReply = plantpb_pb2.WeedOutReply
+_InsecticideReply = plantpb_pb2.InsecticideReply
+_ShopInfoReply = shoppb_pb2.ShopInfoReply
+_BuyGoodsReply = shoppb_pb2.BuyGoodsReply
 
 
 def _to_time_sec(raw: int) -> int:
@@ -74,18 +78,16 @@ class FarmService:
         self.analytics = analytics
         self.logger = logger
         self.rpc_timeout_sec = max(1, int(rpc_timeout_sec))
+        # 预绑定服务名与超时，RPC 包装方法只需传方法名与请求体。
+        self._plant_call = partial(session.call, "gamepb.plantpb.PlantService", timeout_sec=self.rpc_timeout_sec)
+        self._shop_call = partial(session.call, "gamepb.shoppb.ShopService", timeout_sec=self.rpc_timeout_sec)
         self.last_plant_error = ""
         self.last_plant_failures: list[dict[str, Any]] = []
 
     async def get_all_lands(self, host_gid: int = 0) -> plantpb_pb2.AllLandsReply:
         req = plantpb_pb2.AllLandsRequest(host_gid=int(host_gid))
-        body = await self.session.call(
-            "gamepb.plantpb.PlantService",
-            "AllLands",
-            req.SerializeToString(),
-            timeout_sec=self.rpc_timeout_sec,
-        )
-        reply = plantpb_pb2.AllLandsReply()
+        body = await self._plant_call("AllLands", req.SerializeToString())
+        reply = _AllLandsReply()
         reply.ParseFromString(body)
         return reply
 
@@ -95,49 +97,29 @@ class FarmService:
             host_gid=int(host_gid),
             is_all=True,
         )
-        body = await self.session.call(
-            "gamepb.plantpb.PlantService",
-            "Harvest",
-            req.SerializeToString(),
-            timeout_sec=self.rpc_timeout_sec,
-        )
-        reply = plantpb_pb2.HarvestReply()
+        body = await self._plant_call("Harvest", req.SerializeToString())
+        reply = _HarvestReply()
         reply.ParseFromString(body)
         return reply
 
     async def water(self, land_ids: list[int], host_gid: int) -> plantpb_pb2.WaterLandReply:
         req = plantpb_pb2.WaterLandRequest(land_ids=[int(v) for v in land_ids], host_gid=int(host_gid))
-        body = await self.session.call(
-            "gamepb.plantpb.PlantService",
-            "WaterLand",
-            req.SerializeToString(),
-            timeout_sec=self.rpc_timeout_sec,
-        )
-        reply = plantpb_pb2.WaterLandReply()
+        body = await self._plant_call("WaterLand", req.SerializeToString())
+        reply = _WaterLandReply()
         reply.ParseFromString(body)
         return reply
 
     async def weed(self, land_ids: list[int], host_gid: int) -> plantpb_pb2.WeedOutReply:
         req = plantpb_pb2.WeedOutRequest(land_ids=[int(v) for v in land_ids], host_gid=int(host_gid))
-        body = await self.session.call(
-            "gamepb.plantpb.PlantService",
-            "WeedOut",
-            req.SerializeToString(),
-            timeout_sec=self.rpc_timeout_sec,
-        )
-        reply = plantpb_pb2.WeedOutReply()
+        body = await self._plant_call("WeedOut", req.SerializeToString())
+        reply = _WeedOutReply()
         reply.ParseFromString(body)
         return reply
 
     async def bug(self, land_ids: list[int], host_gid: int) -> plantpb_pb2.InsecticideReply:
         req = plantpb_pb2.InsecticideRequest(land_ids=[int(v) for v in land_ids], host_gid=int(host_gid))
-        body = await self.session.call(
-            "gamepb.plantpb.PlantService",
-            "Insecticide",
-            req.SerializeToString(),
-            timeout_sec=self.rpc_timeout_sec,
-        )
-        reply = plantpb_pb2.InsecticideReply()
+        body = await self._plant_call("Insecticide", req.SerializeToString())
+        reply = _InsecticideReply()
         reply.ParseFromString(body)
         return reply
 
@@ -149,12 +131,7 @@ class FarmService:
                 fertilizer_id=int(fertilizer_id),
             )
             try:
-                await self.session.call(
-                    "gamepb.plantpb.PlantService",
-                    "Fertilize",
-                    req.SerializeToString(),
-                    timeout_sec=self.rpc_timeout_sec,
-                )
+                await self._plant_call("Fertilize", req.SerializeToString())
                 ok += 1
             except Exception:
                 break
@@ -164,30 +141,15 @@ class FarmService:
 
     async def remove_plant(self, land_ids: list[int]) -> None:
         req = plantpb_pb2.RemovePlantRequest(land_ids=[int(v) for v in land_ids])
-        await self.session.call(
-            "gamepb.plantpb.PlantService",
-            "RemovePlant",
-            req.SerializeToString(),
-            timeout_sec=self.rpc_timeout_sec,
-        )
+        await self._plant_call("RemovePlant", req.SerializeToString())
 
     async def upgrade_land(self, land_id: int) -> None:
         req = plantpb_pb2.UpgradeLandRequest(land_id=int(land_id))
-        await self.session.call(
-            "gamepb.plantpb.PlantService",
-            "UpgradeLand",
-            req.SerializeToString(),
-            timeout_sec=self.rpc_timeout_sec,
-        )
+        await self._plant_call("UpgradeLand", req.SerializeToString())
 
     async def unlock_land(self, land_id: int, do_shared: bool = False) -> None:
         req = plantpb_pb2.UnlockLandRequest(land_id=int(land_id), do_shared=bool(do_shared))
-        await self.session.call(
-            "gamepb.plantpb.PlantService",
-            "UnlockLand",
-            req.SerializeToString(),
-            timeout_sec=self.rpc_timeout_sec,
-        )
+        await self._plant_call("UnlockLand", req.SerializeToString())
 
     async def plant(self, seed_id: int, land_ids: list[int]) -> int:
         # 对齐 Node：使用 PlantRequest.items(seed_id + land_ids) 语义发送。
@@ -200,24 +162,14 @@ class FarmService:
             item.seed_id = int(seed_id)
             item.land_ids.append(int(land_id))
             try:
-                await self.session.call(
-                    "gamepb.plantpb.PlantService",
-                    "Plant",
-                    request_items.SerializeToString(),
-                    timeout_sec=self.rpc_timeout_sec,
-                )
+                await self._plant_call("Plant", request_items.SerializeToString())
                 ok += 1
             except Exception as e_items:
                 # 兼容回退：若 items 失败，再尝试 map 结构。
                 request_map = plantpb_pb2.PlantRequest()
                 request_map.land_and_seed[int(land_id)] = int(seed_id)
                 try:
-                    await self.session.call(
-                        "gamepb.plantpb.PlantService",
-                        "Plant",
-                        request_map.SerializeToString(),
-                        timeout_sec=self.rpc_timeout_sec,
-                    )
+                    await self._plant_call("Plant", request_map.SerializeToString())
                     ok += 1
                 except Exception as e_map:
                     err_items = _error_text(e_items)
@@ -236,13 +188,8 @@ class FarmService:
 
     async def get_shop_info(self, shop_id: int = 2) -> shoppb_pb2.ShopInfoReply:
         req = shoppb_pb2.ShopInfoRequest(shop_id=int(shop_id))
-        body = await self.session.call(
-            "gamepb.shoppb.ShopService",
-            "ShopInfo",
-            req.SerializeToString(),
-            timeout_sec=self.rpc_timeout_sec,
-        )
-        reply = shoppb_pb2.ShopInfoReply()
+        body = await self._shop_call("ShopInfo", req.SerializeToString())
+        reply = _ShopInfoReply()
         reply.ParseFromString(body)
         return reply
 
@@ -252,17 +199,18 @@ class FarmService:
             num=int(num),
             price=int(price),
         )
-        body = await self.session.call(
-            "gamepb.shoppb.ShopService",
-            "BuyGoods",
-            req.SerializeToString(),
-            timeout_sec=self.rpc_timeout_sec,
-        )
-        reply = shoppb_pb2.BuyGoodsReply()
+        body = await self._shop_call("BuyGoods", req.SerializeToString())
+        reply = _BuyGoodsReply()
         reply.ParseFromString(body)
         return reply
 
-    def analyze_lands(self, lands: list[plantpb_pb2.LandInfo], *, now_sec: int | None = None) -> LandAnalyzeResult:
+    def analyze_lands(
+        self,
+        lands: list[plantpb_pb2.LandInfo],
+        *,
+        now_sec: int | None = None,
+        with_details: bool = True,
+    ) -> LandAnalyzeResult:
         now = int(now_sec or time.time())
         harvestable: list[int] = []
         growing: list[int] = []
@@ -276,36 +224,37 @@ class FarmService:
         details: list[dict[str, Any]] = []
 
         for land in lands:
-            land_id = _to_int(land.id, 0)
-            level = _to_int(land.level, 0)
-            max_level = _to_int(land.max_level, 0)
-            lands_level = _to_int(land.lands_level, 0)
-            land_size = _to_int(land.land_size, 0)
-            could_unlock = bool(land.could_unlock)
-            could_upgrade = bool(land.could_upgrade)
-            if not bool(land.unlocked):
-                details.append(
-                    {
-                        "id": land_id,
-                        "unlocked": False,
-                        "status": "locked",
-                        "plantName": "",
-                        "phaseName": "未解锁",
-                        "level": level,
-                        "maxLevel": max_level,
-                        "landsLevel": lands_level,
-                        "landSize": land_size,
-                        "couldUnlock": could_unlock,
-                        "couldUpgrade": could_upgrade,
-                        "seedId": 0,
-                        "seedImage": "",
-                        "stealable": False,
-                        "matureInSec": 0,
-                        "needWater": False,
-                        "needWeed": False,
-                        "needBug": False,
-                    }
-                )
+            land_id = land.id
+            level = land.level
+            max_level = land.max_level
+            lands_level = land.lands_level
+            land_size = land.land_size
+            could_unlock = land.could_unlock
+            could_upgrade = land.could_upgrade
+            if not land.unlocked:
+                if with_details:
+                    details.append(
+                        {
+                            "id": land_id,
+                            "unlocked": False,
+                            "status": "locked",
+                            "plantName": "",
+                            "phaseName": "未解锁",
+                            "level": level,
+                            "maxLevel": max_level,
+                            "landsLevel": lands_level,
+                            "landSize": land_size,
+                            "couldUnlock": could_unlock,
+                            "couldUpgrade": could_upgrade,
+                            "seedId": 0,
+                            "seedImage": "",
+                            "stealable": False,
+                            "matureInSec": 0,
+                            "needWater": False,
+                            "needWeed": False,
+                            "needBug": False,
+                        }
+                    )
                 if could_unlock:
                     unlockable.append(land_id)
                 continue
@@ -314,46 +263,41 @@ class FarmService:
                 upgradable.append(land_id)
 
             if not land.HasField("plant") or not land.plant.phases:
-                details.append(
-                    {
-                        "id": land_id,
-                        "unlocked": True,
-                        "status": "empty",
-                        "plantName": "",
-                        "phaseName": "空地",
-                        "level": level,
-                        "maxLevel": max_level,
-                        "landsLevel": lands_level,
-                        "landSize": land_size,
-                        "couldUnlock": could_unlock,
-                        "couldUpgrade": could_upgrade,
-                        "seedId": 0,
-                        "seedImage": "",
-                        "stealable": False,
-                        "matureInSec": 0,
-                        "needWater": False,
-                        "needWeed": False,
-                        "needBug": False,
-                    }
-                )
+                if with_details:
+                    details.append(
+                        {
+                            "id": land_id,
+                            "unlocked": True,
+                            "status": "empty",
+                            "plantName": "",
+                            "phaseName": "空地",
+                            "level": level,
+                            "maxLevel": max_level,
+                            "landsLevel": lands_level,
+                            "landSize": land_size,
+                            "couldUnlock": could_unlock,
+                            "couldUpgrade": could_upgrade,
+                            "seedId": 0,
+                            "seedImage": "",
+                            "stealable": False,
+                            "matureInSec": 0,
+                            "needWater": False,
+                            "needWeed": False,
+                            "needBug": False,
+                        }
+                    )
                 empty.append(land_id)
                 continue
 
             plant = land.plant
             phase = self._current_phase(plant, now)
-            phase_val = _to_int(phase.phase, 0) if phase else 0
-            phase_name = PHASE_NAMES.get(phase_val, "未知")
-            plant_id = _to_int(plant.id, 0)
-            plant_name = self.config_data.get_plant_name(plant_id)
-            seed_id = self.config_data.get_seed_id_by_plant(plant_id)
-            seed_image = self.config_data.get_seed_image(seed_id) if seed_id > 0 else ""
+            phase_val = phase.phase if phase else 0
             phase_dry_time = _to_time_sec(phase.dry_time) if phase else 0
             phase_weed_time = _to_time_sec(phase.weeds_time) if phase else 0
             phase_bug_time = _to_time_sec(phase.insect_time) if phase else 0
-            need_w = _to_int(plant.dry_num, 0) > 0 or (phase_dry_time > 0 and phase_dry_time <= now)
-            need_g = len(list(plant.weed_owners)) > 0 or (phase_weed_time > 0 and phase_weed_time <= now)
-            need_b = len(list(plant.insect_owners)) > 0 or (phase_bug_time > 0 and phase_bug_time <= now)
-            mature_in_sec = 0
+            need_w = plant.dry_num > 0 or (phase_dry_time > 0 and phase_dry_time <= now)
+            need_g = len(plant.weed_owners) > 0 or (phase_weed_time > 0 and phase_weed_time <= now)
+            need_b = len(plant.insect_owners) > 0 or (phase_bug_time > 0 and phase_bug_time <= now)
 
             if need_w:
                 need_water.append(land_id)
@@ -372,30 +316,36 @@ class FarmService:
             else:
                 status = "growing"
                 growing.append(land_id)
-                mature_in_sec = self._mature_left_sec(plant, now)
 
-            details.append(
-                {
-                    "id": land_id,
-                    "unlocked": True,
-                    "status": status,
-                    "plantName": plant_name,
-                    "phaseName": phase_name,
-                    "level": level,
-                    "maxLevel": max_level,
-                    "landsLevel": lands_level,
-                    "landSize": land_size,
-                    "couldUnlock": could_unlock,
-                    "couldUpgrade": could_upgrade,
-                    "seedId": seed_id,
-                    "seedImage": seed_image,
-                    "stealable": bool(plant.stealable),
-                    "needWater": need_w,
-                    "needWeed": need_g,
-                    "needBug": need_b,
-                    "matureInSec": mature_in_sec,
-                }
-            )
+            if with_details:
+                phase_name = PHASE_NAMES.get(phase_val, "未知")
+                plant_id = plant.id
+                plant_name = self.config_data.get_plant_name(plant_id)
+                seed_id = self.config_data.get_seed_id_by_plant(plant_id)
+                seed_image = self.config_data.get_seed_image(seed_id) if seed_id > 0 else ""
+                mature_in_sec = self._mature_left_sec(plant, now) if status == "growing" else 0
+                details.append(
+                    {
+                        "id": land_id,
+                        "unlocked": True,
+                        "status": status,
+                        "plantName": plant_name,
+                        "phaseName": phase_name,
+                        "level": level,
+                        "maxLevel": max_level,
+                        "landsLevel": lands_level,
+                        "landSize": land_size,
+                        "couldUnlock": could_unlock,
+                        "couldUpgrade": could_upgrade,
+                        "seedId": seed_id,
+                        "seedImage": seed_image,
+                        "stealable": plant.stealable,
+                        "needWater": need_w,
+                        "needWeed": need_g,
+                        "needBug": need_b,
+                        "matureInSec": mature_in_sec,
+                    }
+                )
 
         return LandAnalyzeResult(
             harvestable=harvestable,
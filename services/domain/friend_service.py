@@ -3,21 +3,64 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from operator import itemgetter
 from typing import Any
 
 from ..protocol.session import GatewaySession
 from ..protocol.proto import friendpb_pb2, plantpb_pb2, visitpb_pb2
+from ._common import _to_int, gather_bounded
 from .config_data import GameConfigData
 
 LOGGER = logging.getLogger(__name__)
 
-
-def _to_int(value: Any, default: int = 0) -> int:
-    try:
-        return int(value)
-    except Exception:
-        return int(default)
+# 无字段请求的序列化结果恒定，模块加载时编码一次即可复用。
+_GET_ALL_REQUEST = friendpb_pb2.GetAllRequest().SerializeToString()
+_GET_APPLICATIONS_REQUEST = friendpb_pb2.GetApplicationsRequest().SerializeToString()
+
+_MATURE = plantpb_pb2.MATURE
+_DEAD = plantpb_pb2.DEAD
+_PHASE_NAMES = ("未知", "种子", "发芽", "小叶", "大叶", "开花", "成熟", "枯萎")
+
+# 未解锁/空地行除 id、level 外全是常量，按固定键序模板浅拷贝后回填。
+_LOCKED_LAND_ROW: dict[str, Any] = {
+    "id": 0,
+    "unlocked": False,
+    "status": "locked",
+    "plantName": "",
+    "phaseName": "未解锁",
+    "level": 0,
+    "needWater": False,
+    "needWeed": False,
+    "needBug": False,
+}
+_EMPTY_LAND_ROW: dict[str, Any] = {
+    **_LOCKED_LAND_ROW,
+    "unlocked": True,
+    "status": "empty",
+    "phaseName": "空地",
+}
+
+
+def _positive_ids(values: list[Any]) -> list[int]:
+    ids: list[int] = []
+    append = ids.append
+    for value in values:
+        n = _to_int(value, 0)
+        if n > 0:
+            append(n)
+    return ids
+
+
+def _copy_friend_rows(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    # 缓存行按调用方逐份复制（含嵌套 plant），调用方改动不会污染缓存。
+    return [{**row, "plant": dict(row["plant"])} for row in rows]
+
+
+async def _no_probe() -> tuple[bool, int]:
+    return False, 0
 
 
 def _to_time_sec(raw: int) -> int:
@@ -29,16 +72,27 @@ def _to_time_sec(raw: int) -> int:
     return n
 
 
+@dataclass(slots=True)
+class OperationLimitState:
+    day_times: int
+    day_times_limit: int
+    day_exp_times: int
+    day_exp_times_limit: int
+
+
 class FriendService:
-    OP_NAMES = {
-        10001: "收获",
-        10002: "铲除",
-        10003: "放草",
-        10004: "放虫",
-        10005: "除草",
-        10006: "除虫",
-        10007: "浇水",
-        10008: "偷菜",
+    # 操作 ID 连续分布于 10001..10008，按偏移直接索引。
+    OP_ID_BASE = 10001
+    OP_NAMES = ("收获", "铲除", "放草", "放虫", "除草", "除虫", "浇水", "偷菜")
+    PER_LAND_CONCURRENCY = 8
+    FRIENDS_CACHE_TTL_SEC = 10.0
+
+    # op -> (analyze 结果键, 操作 ID, 完成动词, 次数用尽提示)
+    _HELP_OPS = {
+        "steal": ("stealable", 10008, "偷取", "偷菜"),
+        "water": ("needWater", 10007, "浇水", "浇水"),
+        "weed": ("needWeed", 10005, "除草", "除草"),
+        "bug": ("needBug", 10006, "除虫", "除虫"),
     }
 
     def __init__(
@@ -47,19 +101,22 @@ class FriendService:
         config_data: GameConfigData,
         *,
         rpc_timeout_sec: int = 10,
+        max_friend_concurrency: int = 4,
     ) -> None:
         self.session = session
         self.config_data = config_data
         self.rpc_timeout_sec = max(1, int(rpc_timeout_sec))
-        self._operation_limits: dict[int, dict[str, int]] = {}
+        self.max_friend_concurrency = max(1, int(max_friend_concurrency))
+        self._operation_limits: dict[int, OperationLimitState] = {}
         self._last_reset_day = ""
+        self._next_reset_at = 0.0
+        self._friends_cache: tuple[int, float, list[dict[str, Any]]] | None = None
 
     async def get_all_friends(self) -> friendpb_pb2.GetAllReply:
-        req = friendpb_pb2.GetAllRequest()
         body = await self.session.call(
             "gamepb.friendpb.FriendService",
             "GetAll",
-            req.SerializeToString(),
+            _GET_ALL_REQUEST,
             timeout_sec=self.rpc_timeout_sec,
         )
         reply = friendpb_pb2.GetAllReply()
@@ -67,11 +124,10 @@ class FriendService:
         return reply
 
     async def get_applications(self) -> friendpb_pb2.GetApplicationsReply:
-        req = friendpb_pb2.GetApplicationsRequest()
         body = await self.session.call(
             "gamepb.friendpb.FriendService",
             "GetApplications",
-            req.SerializeToString(),
+            _GET_APPLICATIONS_REQUEST,
             timeout_sec=self.rpc_timeout_sec,
         )
         reply = friendpb_pb2.GetApplicationsReply()
@@ -79,7 +135,7 @@ class FriendService:
         return reply
 
     async def accept_friends(self, gids: list[int]) -> friendpb_pb2.AcceptFriendsReply:
-        req = friendpb_pb2.AcceptFriendsRequest(friend_gids=[_to_int(g, 0) for g in gids if _to_int(g, 0) > 0])
+        req = friendpb_pb2.AcceptFriendsRequest(friend_gids=_positive_ids(gids))
         body = await self.session.call(
             "gamepb.friendpb.FriendService",
             "AcceptFriends",
@@ -88,6 +144,7 @@ class FriendService:
         )
         reply = friendpb_pb2.AcceptFriendsReply()
         reply.ParseFromString(body)
+        self.invalidate_friends()
         return reply
 
     async def enter_friend_farm(self, friend_gid: int) -> visitpb_pb2.EnterReply:
@@ -119,7 +176,7 @@ class FriendService:
 
     async def help_water(self, friend_gid: int, land_ids: list[int]) -> plantpb_pb2.WaterLandReply:
         req = plantpb_pb2.WaterLandRequest(
-            land_ids=[_to_int(v, 0) for v in land_ids if _to_int(v, 0) > 0],
+            land_ids=_positive_ids(land_ids),
             host_gid=_to_int(friend_gid, 0),
         )
         body = await self.session.call(
@@ -135,7 +192,7 @@ class FriendService:
 
     async def help_weed(self, friend_gid: int, land_ids: list[int]) -> plantpb_pb2.WeedOutReply:
         req = plantpb_pb2.WeedOutRequest(
-            land_ids=[_to_int(v, 0) for v in land_ids if _to_int(v, 0) > 0],
+            land_ids=_positive_ids(land_ids),
             host_gid=_to_int(friend_gid, 0),
         )
         body = await self.session.call(
@@ -151,7 +208,7 @@ class FriendService:
 
     async def help_bug(self, friend_gid: int, land_ids: list[int]) -> plantpb_pb2.InsecticideReply:
         req = plantpb_pb2.InsecticideRequest(
-            land_ids=[_to_int(v, 0) for v in land_ids if _to_int(v, 0) > 0],
+            land_ids=_positive_ids(land_ids),
             host_gid=_to_int(friend_gid, 0),
         )
         body = await self.session.call(
@@ -167,7 +224,7 @@ class FriendService:
 
     async def steal_harvest(self, friend_gid: int, land_ids: list[int]) -> plantpb_pb2.HarvestReply:
         req = plantpb_pb2.HarvestRequest(
-            land_ids=[_to_int(v, 0) for v in land_ids if _to_int(v, 0) > 0],
+            land_ids=_positive_ids(land_ids),
             host_gid=_to_int(friend_gid, 0),
             is_all=True,
         )
@@ -183,50 +240,36 @@ class FriendService:
         return reply
 
     async def put_insects(self, friend_gid: int, land_ids: list[int]) -> int:
-        ok = 0
-        for land_id in land_ids:
-            req = plantpb_pb2.PutInsectsRequest(
-                host_gid=_to_int(friend_gid, 0),
-                land_ids=[_to_int(land_id, 0)],
-            )
-            try:
-                body = await self.session.call(
-                    "gamepb.plantpb.PlantService",
-                    "PutInsects",
-                    req.SerializeToString(),
-                    timeout_sec=self.rpc_timeout_sec,
-                )
-                reply = plantpb_pb2.PutInsectsReply()
-                reply.ParseFromString(body)
-                self.update_operation_limits(reply.operation_limits)
-                ok += 1
-            except Exception:
-                continue
-            await asyncio.sleep(0.1)
-        return ok
+        host_gid = _to_int(friend_gid, 0)
+        return await self._gather_ok(
+            land_ids,
+            lambda land_id: self._put_one(
+                "PutInsects",
+                plantpb_pb2.PutInsectsRequest(host_gid=host_gid, land_ids=[_to_int(land_id, 0)]),
+                plantpb_pb2.PutInsectsReply(),
+            ),
+        )
 
     async def put_weeds(self, friend_gid: int, land_ids: list[int]) -> int:
-        ok = 0
-        for land_id in land_ids:
-            req = plantpb_pb2.PutWeedsRequest(
-                host_gid=_to_int(friend_gid, 0),
-                land_ids=[_to_int(land_id, 0)],
-            )
-            try:
-                body = await self.session.call(
-                    "gamepb.plantpb.PlantService",
-                    "PutWeeds",
-                    req.SerializeToString(),
-                    timeout_sec=self.rpc_timeout_sec,
-                )
-                reply = plantpb_pb2.PutWeedsReply()
-                reply.ParseFromString(body)
-                self.update_operation_limits(reply.operation_limits)
-                ok += 1
-            except Exception:
-                continue
-            await asyncio.sleep(0.1)
-        return ok
+        host_gid = _to_int(friend_gid, 0)
+        return await self._gather_ok(
+            land_ids,
+            lambda land_id: self._put_one(
+                "PutWeeds",
+                plantpb_pb2.PutWeedsRequest(host_gid=host_gid, land_ids=[_to_int(land_id, 0)]),
+                plantpb_pb2.PutWeedsReply(),
+            ),
+        )
+
+    async def _put_one(self, method: str, req: Any, reply: Any) -> None:
+        body = await self.session.call(
+            "gamepb.plantpb.PlantService",
+            method,
+            req.SerializeToString(),
+            timeout_sec=self.rpc_timeout_sec,
+        )
+        reply.ParseFromString(body)
+        self.update_operation_limits(reply.operation_limits)
 
     async def check_can_operate_remote(self, friend_gid: int, operation_id: int) -> tuple[bool, int]:
         req = plantpb_pb2.CheckCanOperateRequest(
@@ -242,7 +285,7 @@ class FriendService:
             )
             reply = plantpb_pb2.CheckCanOperateReply()
             reply.ParseFromString(body)
-            return bool(reply.can_operate), _to_int(reply.can_steal_num, 0)
+            return reply.can_operate, reply.can_steal_num
         except Exception as e:
             LOGGER.warning(
                 "check_can_operate_remote failed, deny operation: friend_gid=%s, operation_id=%s, error=%s",
@@ -258,26 +301,26 @@ class FriendService:
             return
         self._check_daily_reset()
         for limit in limits:
-            op_id = _to_int(limit.id, 0)
+            op_id = limit.id
             if op_id <= 0:
                 continue
-            self._operation_limits[op_id] = {
-                "dayTimes": _to_int(limit.day_times, 0),
-                "dayTimesLimit": _to_int(limit.day_times_lt, 0),
-                "dayExpTimes": _to_int(limit.day_exp_times, 0),
-                "dayExpTimesLimit": _to_int(limit.day_ex_times_lt, 0),
-            }
+            self._operation_limits[op_id] = OperationLimitState(
+                day_times=limit.day_times,
+                day_times_limit=limit.day_times_lt,
+                day_exp_times=limit.day_exp_times,
+                day_exp_times_limit=limit.day_ex_times_lt,
+            )
 
     def get_operation_limits(self) -> dict[int, dict[str, int | str]]:
         self._check_daily_reset()
         result: dict[int, dict[str, int | str]] = {}
         for op_id, row in self._operation_limits.items():
             result[op_id] = {
-                "name": self.OP_NAMES.get(op_id, f"#{op_id}"),
-                "dayTimes": row["dayTimes"],
-                "dayTimesLimit": row["dayTimesLimit"],
-                "dayExpTimes": row["dayExpTimes"],
-                "dayExpTimesLimit": row["dayExpTimesLimit"],
+                "name": self._op_name(op_id),
+                "dayTimes": row.day_times,
+                "dayTimesLimit": row.day_times_limit,
+                "dayExpTimes": row.day_exp_times,
+                "dayExpTimesLimit": row.day_exp_times_limit,
                 "remaining": self.get_remaining_times(op_id),
             }
         return result
@@ -287,183 +330,202 @@ class FriendService:
         row = self._operation_limits.get(_to_int(operation_id, 0))
         if not row:
             return False
-        if row["dayExpTimesLimit"] <= 0:
+        if row.day_exp_times_limit <= 0:
             return True
-        return row["dayExpTimes"] < row["dayExpTimesLimit"]
+        return row.day_exp_times < row.day_exp_times_limit
 
     def can_operate(self, operation_id: int) -> bool:
         self._check_daily_reset()
         row = self._operation_limits.get(_to_int(operation_id, 0))
         if not row:
             return True
-        if row["dayTimesLimit"] <= 0:
+        if row.day_times_limit <= 0:
             return True
-        return row["dayTimes"] < row["dayTimesLimit"]
+        return row.day_times < row.day_times_limit
 
     def get_remaining_times(self, operation_id: int) -> int:
         self._check_daily_reset()
         row = self._operation_limits.get(_to_int(operation_id, 0))
-        if not row or row["dayTimesLimit"] <= 0:
+        if not row or row.day_times_limit <= 0:
             return 999
-        return max(0, row["dayTimesLimit"] - row["dayTimes"])
+        return max(0, row.day_times_limit - row.day_times)
+
+    def analyze_friend_lands(
+        self,
+        lands: Iterable[plantpb_pb2.LandInfo],
+        my_gid: int,
+        *,
+        now_sec: int | None = None,
+    ) -> dict[str, list[Any]]:
+        summary, _ = self._scan_friend_lands(lands, my_gid, now_sec=now_sec, with_rows=False)
+        return summary
+
+    def analyze_friend_lands_detail(
+        self,
+        lands: Iterable[plantpb_pb2.LandInfo],
+        my_gid: int,
+        *,
+        now_sec: int | None = None,
+    ) -> tuple[dict[str, list[Any]], list[dict[str, Any]]]:
+        """单次遍历同时产出操作分类汇总与逐块地展示行。"""
+        return self._scan_friend_lands(lands, my_gid, now_sec=now_sec, with_rows=True)
 
-    def analyze_friend_lands(self, lands: list[plantpb_pb2.LandInfo], my_gid: int) -> dict[str, list[Any]]:
+    def _scan_friend_lands(
+        self,
+        lands: Iterable[plantpb_pb2.LandInfo],
+        my_gid: int,
+        *,
+        now_sec: int | None,
+        with_rows: bool,
+    ) -> tuple[dict[str, list[Any]], list[dict[str, Any]]]:
+        stealable: list[int] = []
+        stealable_info: list[dict[str, Any]] = []
+        need_water: list[int] = []
+        need_weed: list[int] = []
+        need_bug: list[int] = []
+        can_put_weed: list[int] = []
+        can_put_bug: list[int] = []
         result: dict[str, list[Any]] = {
-            "stealable": [],
-            "stealableInfo": [],
-            "needWater": [],
-            "needWeed": [],
-            "needBug": [],
-            "canPutWeed": [],
-            "canPutBug": [],
+            "stealable": stealable,
+            "stealableInfo": stealable_info,
+            "needWater": need_water,
+            "needWeed": need_weed,
+            "needBug": need_bug,
+            "canPutWeed": can_put_weed,
+            "canPutBug": can_put_bug,
         }
+        rows: list[dict[str, Any]] = []
+        mine = _to_int(my_gid, 0)
+        now = int(now_sec or time.time())
+        current_phase_val = self._current_phase_val
+        # 同一好友的多块地常种同一作物，按 plant_id 记住配置查表结果。
+        plant_meta: dict[int, tuple[str, int, str]] = {}
 
         for land in lands:
-            land_id = _to_int(land.id, 0)
-            if not land.HasField("plant") or not land.plant.phases:
-                continue
+            land_id = land.id
+            # 未设置的 plant 子消息读出为空实例，phases 为空即可覆盖“无作物”。
             plant = land.plant
-            phase = self._current_phase(plant)
-            phase_val = _to_int(phase.phase, 0) if phase else 0
-
-            if phase_val == plantpb_pb2.MATURE:
-                if bool(plant.stealable):
-                    result["stealable"].append(land_id)
-                    plant_id = _to_int(plant.id, 0)
-                    result["stealableInfo"].append(
-                        {
-                            "landId": land_id,
-                            "plantId": plant_id,
-                            "name": self.config_data.get_plant_name(plant_id),
-                        }
-                    )
+            phases = plant.phases
+            unlocked = land.unlocked
+            if with_rows and (not unlocked or not phases):
+                row = (_EMPTY_LAND_ROW if unlocked else _LOCKED_LAND_ROW).copy()
+                row["id"] = land_id
+                row["level"] = land.level
+                rows.append(row)
+            if not phases:
                 continue
 
-            if phase_val == plantpb_pb2.DEAD:
+            phase_val = current_phase_val(plant, now)
+            weed_owners = plant.weed_owners
+            bug_owners = plant.insect_owners
+            weed_n = len(weed_owners)
+            bug_n = len(bug_owners)
+            plant_id = plant.id
+            meta = None
+            if with_rows or (phase_val == _MATURE and plant.stealable):
+                meta = plant_meta.get(plant_id)
+                if meta is None:
+                    if with_rows:
+                        meta = self._plant_meta(plant_id)
+                    else:
+                        meta = (self.config_data.get_plant_name(plant_id), 0, "")
+                    plant_meta[plant_id] = meta
+
+            if phase_val == _MATURE:
+                if plant.stealable:
+                    stealable.append(land_id)
+                    stealable_info.append({"landId": land_id, "plantId": plant_id, "name": meta[0]})
+            elif phase_val != _DEAD:
+                if plant.dry_num > 0:
+                    need_water.append(land_id)
+                # 直接在 repeated 字段上取长度与成员判断，owner 本身即 int64，无需复制或逐个转换。
+                if weed_n:
+                    need_weed.append(land_id)
+                if bug_n:
+                    need_bug.append(land_id)
+                if weed_n < 2 and mine not in weed_owners:
+                    can_put_weed.append(land_id)
+                if bug_n < 2 and mine not in bug_owners:
+                    can_put_bug.append(land_id)
+
+            if not with_rows or not unlocked:
                 continue
+            plant_name, seed_id, seed_image = meta
+            mature_at = 0
+            for item in phases:
+                if item.phase == _MATURE:
+                    begin = _to_time_sec(item.begin_time)
+                    if begin > 0 and (mature_at == 0 or begin < mature_at):
+                        mature_at = begin
+            if phase_val == _MATURE:
+                status = "stealable" if plant.stealable else "harvested"
+            elif phase_val == _DEAD:
+                status = "dead"
+            else:
+                status = "growing"
+            rows.append(
+                {
+                    "id": land_id,
+                    "unlocked": True,
+                    "status": status,
+                    "plantName": plant_name,
+                    "seedId": seed_id,
+                    "seedImage": seed_image,
+                    "phaseName": self._phase_name(phase_val),
+                    "level": land.level,
+                    "matureInSec": max(0, mature_at - now) if mature_at > 0 else 0,
+                    "needWater": plant.dry_num > 0,
+                    "needWeed": weed_n > 0,
+                    "needBug": bug_n > 0,
+                }
+            )
 
-            if _to_int(plant.dry_num, 0) > 0:
-                result["needWater"].append(land_id)
-
-            weed_owners = list(plant.weed_owners or [])
-            bug_owners = list(plant.insect_owners or [])
-            if weed_owners:
-                result["needWeed"].append(land_id)
-            if bug_owners:
-                result["needBug"].append(land_id)
-
-            i_put_weed = any(_to_int(v, 0) == _to_int(my_gid, 0) for v in weed_owners)
-            i_put_bug = any(_to_int(v, 0) == _to_int(my_gid, 0) for v in bug_owners)
-            if len(weed_owners) < 2 and not i_put_weed:
-                result["canPutWeed"].append(land_id)
-            if len(bug_owners) < 2 and not i_put_bug:
-                result["canPutBug"].append(land_id)
+        return result, rows
 
-        return result
+    def invalidate_friends(self) -> None:
+        self._friends_cache = None
 
     async def get_friends_list(self, my_gid: int) -> list[dict[str, Any]]:
+        mine = _to_int(my_gid, 0)
+        # 同一时段内状态页与自动化循环常连续拉取好友列表，短 TTL 内复用上一次 GetAll 结果。
+        cached = self._friends_cache
+        if cached is not None and cached[0] == mine and time.monotonic() - cached[1] < self.FRIENDS_CACHE_TTL_SEC:
+            return _copy_friend_rows(cached[2])
         reply = await self.get_all_friends()
         rows: list[dict[str, Any]] = []
         for friend in reply.game_friends:
-            gid = _to_int(friend.gid, 0)
-            if gid <= 0 or gid == _to_int(my_gid, 0):
+            gid = friend.gid
+            if gid <= 0 or gid == mine:
                 continue
             name = str(friend.remark or friend.name or f"GID:{gid}")
             if name == "小小农夫":
                 continue
+            plant = friend.plant
             rows.append(
                 {
                     "gid": gid,
                     "name": name,
                     "plant": {
-                        "stealNum": _to_int(friend.plant.steal_plant_num, 0) if friend.HasField("plant") else 0,
-                        "dryNum": _to_int(friend.plant.dry_num, 0) if friend.HasField("plant") else 0,
-                        "weedNum": _to_int(friend.plant.weed_num, 0) if friend.HasField("plant") else 0,
-                        "insectNum": _to_int(friend.plant.insect_num, 0) if friend.HasField("plant") else 0,
+                        "stealNum": plant.steal_plant_num,
+                        "dryNum": plant.dry_num,
+                        "weedNum": plant.weed_num,
+                        "insectNum": plant.insect_num,
                     },
                 }
             )
-        rows.sort(key=lambda x: (str(x.get("name") or ""), _to_int(x.get("gid"), 0)))
-        return rows
+        # name/gid 在入列时已分别归一为 str/int，直接按键取值排序。
+        rows.sort(key=itemgetter("name", "gid"))
+        self._friends_cache = (mine, time.monotonic(), rows)
+        return _copy_friend_rows(rows)
 
     async def get_friend_lands_detail(self, friend_gid: int, my_gid: int) -> dict[str, Any]:
-        enter = await self.enter_friend_farm(friend_gid)
-        lands = list(enter.lands or [])
-        analyzed = self.analyze_friend_lands(lands, my_gid=my_gid)
-        now_sec = int(time.time())
-        rows: list[dict[str, Any]] = []
-        try:
-            for land in lands:
-                land_id = _to_int(land.id, 0)
-                level = _to_int(land.level, 0)
-                if not bool(land.unlocked):
-                    rows.append(
-                        {
-                            "id": land_id,
-                            "unlocked": False,
-                            "status": "locked",
-                            "plantName": "",
-                            "phaseName": "未解锁",
-                            "level": level,
-                            "needWater": False,
-                            "needWeed": False,
-                            "needBug": False,
-                        }
-                    )
-                    continue
-                if not land.HasField("plant") or not land.plant.phases:
-                    rows.append(
-                        {
-                            "id": land_id,
-                            "unlocked": True,
-                            "status": "empty",
-                            "plantName": "",
-                            "phaseName": "空地",
-                            "level": level,
-                            "needWater": False,
-                            "needWeed": False,
-                            "needBug": False,
-                        }
-                    )
-                    continue
-                plant = land.plant
-                phase = self._current_phase(plant)
-                phase_val = _to_int(phase.phase, 0) if phase else 0
-                phase_name = self._phase_name(phase_val)
-                plant_id = _to_int(plant.id, 0)
-                seed_id = _to_int((self.config_data.get_plant_by_id(plant_id) or {}).get("seed_id"), 0)
-                mature_at = 0
-                for item in plant.phases:
-                    if _to_int(item.phase, 0) == plantpb_pb2.MATURE:
-                        begin = _to_time_sec(item.begin_time)
-                        if begin > 0 and (mature_at == 0 or begin < mature_at):
-                            mature_at = begin
-                mature_in_sec = max(0, mature_at - now_sec) if mature_at > 0 else 0
-                if phase_val == plantpb_pb2.MATURE:
-                    status = "stealable" if bool(plant.stealable) else "harvested"
-                elif phase_val == plantpb_pb2.DEAD:
-                    status = "dead"
-                else:
-                    status = "growing"
-                rows.append(
-                    {
-                        "id": land_id,
-                        "unlocked": True,
-                        "status": status,
-                        "plantName": self.config_data.get_plant_name(plant_id),
-                        "seedId": seed_id,
-                        "seedImage": self.config_data.get_seed_image(seed_id),
-                        "phaseName": phase_name,
-                        "level": level,
-                        "matureInSec": mature_in_sec,
-                        "needWater": _to_int(plant.dry_num, 0) > 0,
-                        "needWeed": len(list(plant.weed_owners or [])) > 0,
-                        "needBug": len(list(plant.insect_owners or [])) > 0,
-                    }
-                )
+        async with self._visit(friend_gid) as enter:
+            analyzed, rows = self.analyze_friend_lands_detail(enter.lands, my_gid=my_gid)
             return {"lands": rows, "summary": analyzed}
-        finally:
-            await self.leave_friend_farm(friend_gid)
+
+    def _plant_meta(self, plant_id: int) -> tuple[str, int, str]:
+        seed_id = self.config_data.get_seed_id_by_plant(plant_id)
+        return self.config_data.get_plant_name(plant_id), seed_id, self.config_data.get_seed_image(seed_id)
 
     async def do_friend_operation(
         self,
@@ -478,104 +540,200 @@ class FriendService:
             return {"ok": False, "opType": op_type, "count": 0, "message": "无效好友ID"}
         op = str(op_type or "").strip().lower()
         try:
-            enter = await self.enter_friend_farm(gid)
+            async with self._visit(gid) as enter:
+                try:
+                    analyzed = self.analyze_friend_lands(enter.lands, my_gid=my_gid)
+                    return await self._run_friend_op(gid, op, analyzed, on_after_steal=on_after_steal)
+                except Exception as e:
+                    return {"ok": False, "opType": op, "count": 0, "message": str(e)}
         except Exception as e:
             return {"ok": False, "opType": op, "count": 0, "message": f"进入好友农场失败: {e}"}
+
+    async def do_friend_operations(
+        self,
+        friend_gid: int,
+        ops: list[str],
+        *,
+        my_gid: int,
+        on_after_steal: Callable[[], Awaitable[None] | None] | None = None,
+    ) -> list[dict[str, Any]]:
+        """单次进入好友农场执行多个操作，结果顺序与 ops 一致；捣乱在清除类操作之后执行。"""
+        op_list = list(dict.fromkeys(str(v or "").strip().lower() for v in ops))
+        gid = _to_int(friend_gid, 0)
+        if gid <= 0:
+            return [{"ok": False, "opType": op, "count": 0, "message": "无效好友ID"} for op in op_list]
+        if not op_list:
+            return []
+        refresh = False
         try:
-            analyzed = self.analyze_friend_lands(list(enter.lands or []), my_gid=my_gid)
-            if op == "steal":
-                targets = list(analyzed["stealable"])
-                if not targets:
-                    return {"ok": True, "opType": op, "count": 0, "message": "没有可偷取土地"}
-                can_operate, can_num = await self.check_can_operate_remote(gid, 10008)
-                if not can_operate:
-                    return {"ok": True, "opType": op, "count": 0, "message": "今日偷菜次数已用完"}
-                if can_num > 0:
-                    targets = targets[:can_num]
-                count = await self._run_batch_with_fallback(
-                    targets,
-                    batch_fn=lambda ids: self.steal_harvest(gid, ids),
-                    single_fn=lambda ids: self.steal_harvest(gid, ids),
+            async with self._visit(gid) as enter:
+                analyzed = self.analyze_friend_lands(enter.lands, my_gid=my_gid)
+                # 先并发探测各操作的剩余次数，整轮只付一次进出农场的往返。
+                first_ops = [op for op in op_list if op != "bad"]
+                probe_ops = [op for op in first_ops if op in self._HELP_OPS and analyzed[self._HELP_OPS[op][0]]]
+                probes = await asyncio.gather(
+                    *(self.check_can_operate_remote(gid, self._HELP_OPS[op][1]) for op in probe_ops)
                 )
-                if count > 0 and on_after_steal:
-                    ret = on_after_steal()
-                    if asyncio.iscoroutine(ret):
-                        await ret
-                return {"ok": True, "opType": op, "count": count, "message": f"偷取完成 {count} 块"}
-
-            if op == "water":
-                targets = list(analyzed["needWater"])
-                if not targets:
-                    return {"ok": True, "opType": op, "count": 0, "message": "没有可浇水土地"}
-                can_operate, _ = await self.check_can_operate_remote(gid, 10007)
-                if not can_operate:
-                    return {"ok": True, "opType": op, "count": 0, "message": "今日浇水次数已用完"}
-                count = await self._run_batch_with_fallback(
-                    targets,
-                    batch_fn=lambda ids: self.help_water(gid, ids),
-                    single_fn=lambda ids: self.help_water(gid, ids),
-                )
-                return {"ok": True, "opType": op, "count": count, "message": f"浇水完成 {count} 块"}
-
-            if op == "weed":
-                targets = list(analyzed["needWeed"])
-                if not targets:
-                    return {"ok": True, "opType": op, "count": 0, "message": "没有可除草土地"}
-                can_operate, _ = await self.check_can_operate_remote(gid, 10005)
-                if not can_operate:
-                    return {"ok": True, "opType": op, "count": 0, "message": "今日除草次数已用完"}
-                count = await self._run_batch_with_fallback(
-                    targets,
-                    batch_fn=lambda ids: self.help_weed(gid, ids),
-                    single_fn=lambda ids: self.help_weed(gid, ids),
-                )
-                return {"ok": True, "opType": op, "count": count, "message": f"除草完成 {count} 块"}
-
-            if op == "bug":
-                targets = list(analyzed["needBug"])
-                if not targets:
-                    return {"ok": True, "opType": op, "count": 0, "message": "没有可除虫土地"}
-                can_operate, _ = await self.check_can_operate_remote(gid, 10006)
-                if not can_operate:
-                    return {"ok": True, "opType": op, "count": 0, "message": "今日除虫次数已用完"}
-                count = await self._run_batch_with_fallback(
-                    targets,
-                    batch_fn=lambda ids: self.help_bug(gid, ids),
-                    single_fn=lambda ids: self.help_bug(gid, ids),
-                )
-                return {"ok": True, "opType": op, "count": count, "message": f"除虫完成 {count} 块"}
-
-            if op == "bad":
-                bug_count = 0
-                weed_count = 0
-                if analyzed["canPutBug"]:
-                    bug_count = await self.put_insects(gid, list(analyzed["canPutBug"]))
-                if analyzed["canPutWeed"]:
-                    weed_count = await self.put_weeds(gid, list(analyzed["canPutWeed"]))
-                total = bug_count + weed_count
-                if total <= 0:
-                    return {
-                        "ok": True,
-                        "opType": op,
-                        "count": 0,
-                        "bugCount": 0,
-                        "weedCount": 0,
-                        "message": "没有可捣乱土地或次数已用完",
-                    }
+                capabilities = dict(zip(probe_ops, probes))
+
+                async def _run(op: str) -> Any:
+                    try:
+                        return await self._run_friend_op(
+                            gid,
+                            op,
+                            analyzed,
+                            on_after_steal=on_after_steal,
+                            capability=capabilities.get(op),
+                        )
+                    except Exception as e:
+                        return e
+
+                # 偷菜带 on_after_steal 副作用回调，保持先于其他操作单独执行；帮忙类操作之间互不依赖，再并发执行。
+                by_op: dict[str, Any] = {}
+                if "steal" in first_ops:
+                    by_op["steal"] = await _run("steal")
+                help_ops = [op for op in first_ops if op != "steal"]
+                by_op.update(zip(help_ops, await asyncio.gather(*(_run(op) for op in help_ops))))
+                # 捣乱依赖清除类操作之后的地块状态：地块未被改动时直接沿用本次进入的快照。
+                refresh = any(isinstance(r, dict) and r.get("count") for r in by_op.values())
+                if "bad" in op_list and not refresh:
+                    by_op["bad"] = await self._run_bad_safely(gid, analyzed)
+        except Exception as e:
+            return [
+                {"ok": False, "opType": op, "count": 0, "message": f"进入好友农场失败: {e}"} for op in op_list
+            ]
+        if "bad" in op_list and refresh:
+            # 地块已被改动：离开后重新进入拉取最新农田再捣乱，Enter/Leave 保持成对。
+            try:
+                async with self._visit(gid) as enter:
+                    analyzed = self.analyze_friend_lands(enter.lands, my_gid=my_gid)
+                    by_op["bad"] = await self._run_bad_safely(gid, analyzed)
+            except Exception as e:
+                by_op["bad"] = {"ok": False, "opType": "bad", "count": 0, "message": f"进入好友农场失败: {e}"}
+        results = [by_op[op] for op in op_list]
+        return [
+            {"ok": False, "opType": op, "count": 0, "message": str(res)} if isinstance(res, Exception) else res
+            for op, res in zip(op_list, results)
+        ]
+
+    async def _run_bad_safely(self, gid: int, analyzed: dict[str, list[Any]]) -> Any:
+        try:
+            return await self._run_friend_op(gid, "bad", analyzed)
+        except Exception as e:
+            return e
+
+    async def do_many_friend_operations(
+        self,
+        pairs: list[tuple[int, list[str]]],
+        *,
+        my_gid: int,
+        on_after_steal: Callable[[], Awaitable[None] | None] | None = None,
+    ) -> list[dict[str, Any]]:
+        """按 (好友 gid, 操作列表) 并发执行，每位好友内部复用 do_friend_operations 的单次进出。"""
+        pairs = list(pairs)
+
+        async def _one(pair: tuple[int, list[str]]) -> list[dict[str, Any]]:
+            gid, ops = pair
+            return await self.do_friend_operations(gid, ops, my_gid=my_gid, on_after_steal=on_after_steal)
+
+        gids = [gid for gid, _ in pairs]
+        results = await gather_bounded(pairs, _one, self.max_friend_concurrency)
+        rows: list[dict[str, Any]] = []
+        for gid, res in zip(gids, results):
+            if isinstance(res, Exception):
+                rows.append({"gid": gid, "ok": False, "results": [], "message": str(res)})
+            else:
+                rows.append({"gid": gid, "ok": all(r.get("ok") for r in res), "results": res})
+        return rows
+
+    @asynccontextmanager
+    async def _visit(self, gid: int) -> AsyncIterator[visitpb_pb2.EnterReply]:
+        enter = await self.enter_friend_farm(gid)
+        try:
+            yield enter
+        finally:
+            # 离开失败只记日志，不能覆盖农场内已完成操作的结果。
+            try:
+                await self.leave_friend_farm(gid)
+            except Exception as e:
+                LOGGER.warning("leave_friend_farm failed: friend_gid=%s, error=%s", gid, e)
+
+    async def _run_friend_op(
+        self,
+        gid: int,
+        op: str,
+        analyzed: dict[str, list[Any]],
+        *,
+        on_after_steal: Callable[[], Awaitable[None] | None] | None = None,
+        capability: tuple[bool, int] | None = None,
+    ) -> dict[str, Any]:
+        spec = self._HELP_OPS.get(op)
+        if spec is not None:
+            key, op_id, verb, quota_label = spec
+            targets = list(analyzed[key])
+            if not targets:
+                return {"ok": True, "opType": op, "count": 0, "message": f"没有可{verb}土地"}
+            can_operate, can_num = capability or await self.check_can_operate_remote(gid, op_id)
+            if not can_operate:
+                return {"ok": True, "opType": op, "count": 0, "message": f"今日{quota_label}次数已用完"}
+            if op == "steal" and can_num > 0:
+                targets = targets[:can_num]
+            action = {
+                "steal": self.steal_harvest,
+                "water": self.help_water,
+                "weed": self.help_weed,
+                "bug": self.help_bug,
+            }[op]
+            count = await self._run_batch_with_fallback(
+                targets,
+                batch_fn=lambda ids: action(gid, ids),
+                single_fn=lambda ids: action(gid, ids),
+            )
+            if count > 0:
+                # 操作改变了好友列表里的可偷/待帮计数，缓存的列表随之作废。
+                self.invalidate_friends()
+            if op == "steal" and count > 0 and on_after_steal:
+                ret = on_after_steal()
+                if asyncio.iscoroutine(ret):
+                    await ret
+            return {"ok": True, "opType": op, "count": count, "message": f"{verb}完成 {count} 块"}
+
+        if op == "bad":
+            bug_count = 0
+            weed_count = 0
+            bug_targets = list(analyzed["canPutBug"])
+            weed_targets = list(analyzed["canPutWeed"])
+            # 放虫(10004)/放草(10003)次数探测并发发出，省掉一次串行往返。
+            (bug_ok, _), (weed_ok, _) = await asyncio.gather(
+                self.check_can_operate_remote(gid, 10004) if bug_targets else _no_probe(),
+                self.check_can_operate_remote(gid, 10003) if weed_targets else _no_probe(),
+            )
+            if bug_targets and bug_ok:
+                bug_count = await self.put_insects(gid, bug_targets)
+            if weed_targets and weed_ok:
+                weed_count = await self.put_weeds(gid, weed_targets)
+            total = bug_count + weed_count
+            if total > 0:
+                self.invalidate_friends()
+            if total <= 0:
                 return {
                     "ok": True,
                     "opType": op,
-                    "count": total,
-                    "bugCount": bug_count,
-                    "weedCount": weed_count,
-                    "message": f"捣乱完成 虫{bug_count}/草{weed_count}",
+                    "count": 0,
+                    "bugCount": 0,
+                    "weedCount": 0,
+                    "message": "没有可捣乱土地或次数已用完",
                 }
+            return {
+                "ok": True,
+                "opType": op,
+                "count": total,
+                "bugCount": bug_count,
+                "weedCount": weed_count,
+                "message": f"捣乱完成 虫{bug_count}/草{weed_count}",
+            }
 
-            return {"ok": False, "opType": op, "count": 0, "message": "未知操作类型"}
-        except Exception as e:
-            return {"ok": False, "opType": op, "count": 0, "message": str(e)}
-        finally:
-            await self.leave_friend_farm(gid)
+        return {"ok": False, "opType": op, "count": 0, "message": "未知操作类型"}
 
     async def _run_batch_with_fallback(
         self,
@@ -591,50 +749,51 @@ class FriendService:
             await batch_fn(targets)
             return len(targets)
         except Exception:
-            ok = 0
-            for land_id in targets:
-                try:
-                    await single_fn([land_id])
-                    ok += 1
-                except Exception:
-                    continue
-                await asyncio.sleep(0.1)
-            return ok
+            return await self._gather_ok(targets, lambda land_id: single_fn([land_id]))
+
+    async def _gather_ok(self, land_ids: list[int], fn: Callable[[int], Awaitable[Any]]) -> int:
+        # 逐地块请求并发发出（受 PER_LAND_CONCURRENCY 限制），总耗时约为一次 RTT 而非 N 次串行。
+        results = await gather_bounded(land_ids, fn, self.PER_LAND_CONCURRENCY)
+        return sum(1 for r in results if not isinstance(r, Exception))
 
     def _check_daily_reset(self) -> None:
-        day = time.strftime("%Y-%m-%d", time.localtime())
+        # 稳态下只做一次浮点比较；跨过本地零点时才重新格式化日期并计算下一个零点。
+        now = time.time()
+        if now < self._next_reset_at:
+            return
+        local = time.localtime(now)
+        day = time.strftime("%Y-%m-%d", local)
         if day != self._last_reset_day:
             self._operation_limits.clear()
             self._last_reset_day = day
+        self._next_reset_at = time.mktime((local.tm_year, local.tm_mon, local.tm_mday + 1, 0, 0, 0, 0, 0, -1))
+
+    @classmethod
+    def _op_name(cls, op_id: int) -> str:
+        idx = op_id - cls.OP_ID_BASE
+        if 0 <= idx < len(cls.OP_NAMES):
+            return cls.OP_NAMES[idx]
+        return f"#{op_id}"
 
     @staticmethod
     def _phase_name(phase_val: int) -> str:
-        names = {
-            0: "未知",
-            1: "种子",
-            2: "发芽",
-            3: "小叶",
-            4: "大叶",
-            5: "开花",
-            6: "成熟",
-            7: "枯萎",
-        }
-        return names.get(_to_int(phase_val, 0), "未知")
+        if 0 <= phase_val < len(_PHASE_NAMES):
+            return _PHASE_NAMES[phase_val]
+        return "未知"
 
     @staticmethod
-    def _current_phase(plant: plantpb_pb2.PlantInfo) -> plantpb_pb2.PlantPhaseInfo | None:
-        now_sec = int(time.time())
-        candidate: plantpb_pb2.PlantPhaseInfo | None = None
+    def _current_phase_val(plant: plantpb_pb2.PlantInfo, now_sec: int) -> int:
+        # 取已开始的最晚阶段，只返回阶段值；毫秒/秒换算内联，避免逐阶段函数调用。
+        phase_val = -1
         candidate_begin = -1
         for phase in plant.phases:
-            begin = _to_time_sec(phase.begin_time)
-            if begin <= 0:
-                continue
-            if begin <= now_sec and begin >= candidate_begin:
-                candidate = phase
+            begin = phase.begin_time
+            if begin > 1_000_000_000_000:
+                begin //= 1000
+            if 0 < begin <= now_sec and begin >= candidate_begin:
+                phase_val = phase.phase
                 candidate_begin = begin
-        if candidate is not None:
-            return candidate
-        if plant.phases:
-            return plant.phases[0]
-        return None
+        if phase_val >= 0:
+            return phase_val
+        phases = plant.phases
+        return phases[0].phase if phases else 0
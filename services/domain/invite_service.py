@@ -1,18 +1,32 @@
 from __future__ import annotations
 
 import asyncio
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
-from urllib.parse import parse_qs
+from urllib.parse import unquote_plus
 
+from ._common import _to_int, gather_bounded
 from .user_service import UserService
 
 
-def _to_int(value: Any, default: int = 0) -> int:
-    try:
-        return int(value)
-    except Exception:
-        return int(default)
+_SHARE_KEYS = ("uid", "openid", "share_source", "doc_id")
+
+
+def _unquote(text: str) -> str:
+    return unquote_plus(text) if ("%" in text or "+" in text) else text
+
+
+@lru_cache(maxsize=4096)
+def _parse_share_query(text: str) -> tuple[str, str, str, str]:
+    # 只关心四个固定键，手工切分代替 parse_qs；同键重复时与 parse_qs(...)[0] 一致取首个值。
+    values: dict[str, str] = {}
+    for part in text.split("&"):
+        key, _, value = part.partition("=")
+        key = _unquote(key)
+        if key in _SHARE_KEYS and key not in values:
+            values[key] = _unquote(value)
+    return tuple(values.get(key, "") for key in _SHARE_KEYS)  # type: ignore[return-value]
 
 
 class InviteService:
@@ -26,8 +40,10 @@ class InviteService:
         share_file_path: Path | None = None,
         logger: Any | None = None,
         log_callback: Any | None = None,
+        concurrency: int = 4,
     ) -> None:
         self.user_service = user_service
+        self.concurrency = max(1, int(concurrency))
         self.platform = str(platform or "qq").strip().lower()
         self.share_file_path = Path(share_file_path) if share_file_path else None
         self.logger = logger
@@ -40,37 +56,34 @@ class InviteService:
             return {"uid": "", "openid": "", "share_source": "", "doc_id": ""}
         if text.startswith("?"):
             text = text[1:]
-        query = parse_qs(text, keep_blank_values=True)
-        return {
-            "uid": str((query.get("uid") or [""])[0] or ""),
-            "openid": str((query.get("openid") or [""])[0] or ""),
-            "share_source": str((query.get("share_source") or [""])[0] or ""),
-            "doc_id": str((query.get("doc_id") or [""])[0] or ""),
-        }
+        return dict(zip(_SHARE_KEYS, _parse_share_query(text)))
 
     def read_share_file(self) -> list[dict[str, str]]:
-        path = self.share_file_path
-        if not path or not path.exists():
-            return []
         try:
-            lines = path.read_text(encoding="utf-8").splitlines()
+            return self._read_share_rows()
         except Exception as e:
             self._log("invite", f"read share file failed: {e}", is_warn=True, event="share_read_failed")
             return []
 
+    def _read_share_rows(self) -> list[dict[str, str]]:
+        path = self.share_file_path
+        if not path or not path.exists():
+            return []
         rows: list[dict[str, str]] = []
         seen_uid: set[str] = set()
-        for line in lines:
-            raw = str(line or "").strip()
-            if not raw or "openid=" not in raw:
-                continue
-            parsed = self.parse_share_link(raw)
-            uid = parsed.get("uid", "").strip()
-            openid = parsed.get("openid", "").strip()
-            if not uid or not openid or uid in seen_uid:
-                continue
-            seen_uid.add(uid)
-            rows.append(parsed)
+        # 逐行流式读取，内存占用与文件大小无关；不含 openid 的行在解析前即跳过。
+        with path.open("r", encoding="utf-8", buffering=1 << 16) as fh:
+            for line in fh:
+                if "openid=" not in line:
+                    continue
+                raw = line.strip()
+                parsed = self.parse_share_link(raw)
+                uid = parsed.get("uid", "").strip()
+                openid = parsed.get("openid", "").strip()
+                if not uid or not openid or uid in seen_uid:
+                    continue
+                seen_uid.add(uid)
+                rows.append(parsed)
         return rows
 
     def clear_share_file(self) -> None:
@@ -87,13 +100,19 @@ class InviteService:
             self._log("invite", "skip invite process for non-wx platform", event="invite_skip_platform", platform=self.platform)
             return {"ok": True, "skipped": True, "reason": "platform_not_wx", "total": 0, "success": 0, "failed": 0}
 
-        rows = self.read_share_file()
+        # 文件读写放到线程池，避免慢盘/大文件阻塞事件循环；日志回调仍在事件循环线程中触发。
+        try:
+            rows = await asyncio.to_thread(self._read_share_rows)
+        except Exception as e:
+            self._log("invite", f"read share file failed: {e}", is_warn=True, event="share_read_failed")
+            rows = []
         if not rows:
             return {"ok": True, "skipped": True, "reason": "empty", "total": 0, "success": 0, "failed": 0}
 
-        success = 0
-        failed = 0
-        for idx, row in enumerate(rows):
+        total = len(rows)
+
+        async def _report(item: tuple[int, dict[str, str]]) -> bool:
+            idx, row = item
             uid = _to_int(row.get("uid"), 0)
             openid = str(row.get("openid") or "")
             share_source = _to_int(row.get("share_source"), 0)
@@ -104,25 +123,29 @@ class InviteService:
                     share_cfg_id=share_source,
                     scene_id="1256",
                 )
-                success += 1
-                self._log("invite", f"invite report ok uid={uid}", event="invite_report_ok", index=idx + 1, total=len(rows), uid=uid)
             except Exception as e:
-                failed += 1
                 self._log(
                     "invite",
                     f"invite report failed uid={uid}: {e}",
                     is_warn=True,
                     event="invite_report_failed",
                     index=idx + 1,
-                    total=len(rows),
+                    total=total,
                     uid=uid,
                 )
-            if idx < len(rows) - 1:
-                await asyncio.sleep(self.REQUEST_DELAY_SEC)
+                return False
+            self._log("invite", f"invite report ok uid={uid}", event="invite_report_ok", index=idx + 1, total=total, uid=uid)
+            return True
+
+        results = await gather_bounded(
+            enumerate(rows), _report, self.concurrency, delay_sec=self.REQUEST_DELAY_SEC
+        )
+        success = sum(1 for ok in results if ok is True)
+        failed = total - success
 
-        self.clear_share_file()
+        await asyncio.to_thread(self.clear_share_file)
         self._log("invite", f"invite process done success={success} failed={failed}", event="invite_done", success=success, failed=failed)
-        return {"ok": True, "skipped": False, "total": len(rows), "success": success, "failed": failed}
+        return {"ok": True, "skipped": False, "total": total, "success": success, "failed": failed}
 
     def _log(self, tag: str, message: str, *, is_warn: bool = False, **meta: Any) -> None:
         if self.logger:
@@ -1,31 +1,33 @@
 from __future__ import annotations
 
-import asyncio
+from collections.abc import Awaitable, Callable
+from itertools import chain
 from typing import Any
 
 from ..protocol.session import GatewaySession
 from ..protocol.proto import taskpb_pb2
+from ._common import InflightCalls, _to_int, gather_bounded
 
-
-def _to_int(value: Any, default: int = 0) -> int:
-    try:
-        return int(value)
-    except Exception:
-        return int(default)
+_TASK_INFO_REQUEST = taskpb_pb2.TaskInfoRequest().SerializeToString()
 
 
 class TaskService:
+    CLAIM_CONCURRENCY = 3
+
     def __init__(self, session: GatewaySession, *, rpc_timeout_sec: int = 10) -> None:
         self.session = session
         self.rpc_timeout_sec = max(1, int(rpc_timeout_sec))
+        self._inflight = InflightCalls()
 
     async def get_task_info(self) -> taskpb_pb2.TaskInfoReply:
-        req = taskpb_pb2.TaskInfoRequest()
-        body = await self.session.call(
-            "gamepb.taskpb.TaskService",
+        body = await self._inflight.run(
             "TaskInfo",
-            req.SerializeToString(),
-            timeout_sec=self.rpc_timeout_sec,
+            lambda: self.session.call(
+                "gamepb.taskpb.TaskService",
+                "TaskInfo",
+                _TASK_INFO_REQUEST,
+                timeout_sec=self.rpc_timeout_sec,
+            ),
         )
         reply = taskpb_pb2.TaskInfoReply()
         reply.ParseFromString(body)
@@ -76,19 +78,21 @@ class TaskService:
         }
 
     def format_task(self, task: taskpb_pb2.Task) -> dict[str, Any]:
-        progress = _to_int(task.progress, 0)
-        total = _to_int(task.total_progress, 0)
-        can_claim = bool(task.is_unlocked and not task.is_claimed and total > 0 and progress >= total)
+        task_id = task.id
+        progress = task.progress
+        total = task.total_progress
+        is_claimed = task.is_claimed
+        is_unlocked = task.is_unlocked
         return {
-            "id": _to_int(task.id, 0),
-            "desc": str(task.desc or f"任务#{_to_int(task.id, 0)}"),
+            "id": task_id,
+            "desc": task.desc or f"任务#{task_id}",
             "progress": progress,
             "totalProgress": total,
-            "isClaimed": bool(task.is_claimed),
-            "isUnlocked": bool(task.is_unlocked),
-            "shareMultiple": _to_int(task.share_multiple, 0),
-            "rewards": [{"id": _to_int(item.id, 0), "count": _to_int(item.count, 0)} for item in task.rewards],
-            "canClaim": can_claim,
+            "isClaimed": is_claimed,
+            "isUnlocked": is_unlocked,
+            "shareMultiple": task.share_multiple,
+            "rewards": [{"id": item.id, "count": item.count} for item in task.rewards],
+            "canClaim": is_unlocked and not is_claimed and total > 0 and progress >= total,
         }
 
     async def check_and_claim_tasks(self) -> dict[str, Any]:
@@ -103,15 +107,17 @@ class TaskService:
             return result
         info = reply.task_info
         claimable = self._collect_claimable_tasks(info)
-        for task in claimable:
-            shared = _to_int(task.share_multiple, 0) > 1
-            try:
-                claimed = await self.claim_task_reward(_to_int(task.id, 0), shared)
-                result["taskClaimed"] += 1
-                result["taskItems"].extend(self._format_items(claimed.items))
-            except Exception:
+        replies = await self._gather_claims(
+            [
+                lambda task=task: self.claim_task_reward(task.id, task.share_multiple > 1)
+                for task in claimable
+            ]
+        )
+        for claimed in replies:
+            if claimed is None:
                 continue
-            await asyncio.sleep(0.2)
+            result["taskClaimed"] += 1
+            result["taskItems"].extend(self._format_items(claimed.items))
         active_done, active_items = await self._claim_actives(info.actives)
         result["activeClaimed"] = active_done
         result["activeItems"] = active_items
@@ -119,37 +125,37 @@ class TaskService:
 
     def _collect_claimable_tasks(self, info: taskpb_pb2.TaskInfo) -> list[taskpb_pb2.Task]:
         rows: list[taskpb_pb2.Task] = []
-        all_rows = list(info.growth_tasks) + list(info.daily_tasks) + list(info.tasks)
-        for task in all_rows:
-            progress = _to_int(task.progress, 0)
-            total = _to_int(task.total_progress, 0)
-            if bool(task.is_unlocked) and (not bool(task.is_claimed)) and total > 0 and progress >= total:
+        for task in chain(info.growth_tasks, info.daily_tasks, info.tasks):
+            total = task.total_progress
+            if task.is_unlocked and not task.is_claimed and total > 0 and task.progress >= total:
                 rows.append(task)
         return rows
 
     async def _claim_actives(self, actives: list[taskpb_pb2.Active]) -> tuple[int, list[dict[str, int]]]:
         claimed = 0
         item_rows: list[dict[str, int]] = []
+        batches: list[tuple[int, list[int]]] = []
         for active in actives:
             point_ids = [
-                _to_int(reward.point_id, 0)
-                for reward in active.rewards
-                if _to_int(reward.status, 0) == taskpb_pb2.DONE and _to_int(reward.point_id, 0) > 0
+                reward.point_id for reward in active.rewards if reward.status == taskpb_pb2.DONE and reward.point_id > 0
             ]
-            if not point_ids:
-                continue
-            try:
-                reply = await self.claim_daily_reward(_to_int(active.type, 0), point_ids)
-                claimed += len(point_ids)
-                item_rows.extend(self._format_items(reply.items))
-            except Exception:
+            if point_ids:
+                batches.append((active.type, point_ids))
+        replies = await self._gather_claims(
+            [lambda t=active_type, p=point_ids: self.claim_daily_reward(t, p) for active_type, point_ids in batches]
+        )
+        for (_, point_ids), reply in zip(batches, replies):
+            if reply is None:
                 continue
-            await asyncio.sleep(0.2)
+            claimed += len(point_ids)
+            item_rows.extend(self._format_items(reply.items))
         return claimed, item_rows
 
+    async def _gather_claims(self, calls: list[Callable[[], Awaitable[Any]]]) -> list[Any | None]:
+        # 各领取请求相互独立：并发发出（受 CLAIM_CONCURRENCY 限制），失败项以 None 占位，结果保持原顺序。
+        results = await gather_bounded(calls, lambda call: call(), self.CLAIM_CONCURRENCY)
+        return [None if isinstance(r, Exception) else r for r in results]
+
     @staticmethod
     def _format_items(items: list[Any]) -> list[dict[str, int]]:
-        rows: list[dict[str, int]] = []
-        for item in items:
-            rows.append({"id": _to_int(getattr(item, "id", 0), 0), "count": _to_int(getattr(item, "count", 0), 0)})
-        return rows
+        return [{"id": item.id, "count": item.count} for item in items]
@@ -1,29 +1,38 @@
 from __future__ import annotations
 
-from typing import Any
-
 from ..protocol.session import GatewaySession
 from ..protocol.proto import userpb_pb2
-
-
-def _to_int(value: Any, default: int = 0) -> int:
-    try:
-        return int(value)
-    except Exception:
-        return int(default)
+from ._common import _to_int
 
 
 class UserService:
     def __init__(self, session: GatewaySession, *, rpc_timeout_sec: int = 10) -> None:
         self.session = session
         self.rpc_timeout_sec = max(1, int(rpc_timeout_sec))
+        self._ark_click_req = userpb_pb2.ReportArkClickRequest()
+        self._login_payload: tuple[str, bytes] | None = None
 
     async def login(self, client_version: str) -> userpb_pb2.LoginReply:
+        body = await self.session.call(
+            "gamepb.userpb.UserService",
+            "Login",
+            self._login_request_bytes(str(client_version or "1.6.0.5_20251224")),
+            timeout_sec=self.rpc_timeout_sec,
+        )
+        reply = userpb_pb2.LoginReply()
+        reply.ParseFromString(body)
+        return reply
+
+    def _login_request_bytes(self, client_version: str) -> bytes:
+        # 登录请求除 client_version 外全是固定值：按版本缓存序列化结果，重连时直接复用。
+        cached = self._login_payload
+        if cached is not None and cached[0] == client_version:
+            return cached[1]
         req = userpb_pb2.LoginRequest(
             sharer_id=0,
             sharer_open_id="",
             device_info=userpb_pb2.DeviceInfo(
-                client_version=str(client_version or "1.6.0.5_20251224"),
+                client_version=client_version,
                 sys_software="iOS 26.2.1",
                 network="wifi",
                 memory=7672,
@@ -42,15 +51,9 @@ class UserService:
                 trackid="",
             ),
         )
-        body = await self.session.call(
-            "gamepb.userpb.UserService",
-            "Login",
-            req.SerializeToString(),
-            timeout_sec=self.rpc_timeout_sec,
-        )
-        reply = userpb_pb2.LoginReply()
-        reply.ParseFromString(body)
-        return reply
+        payload = req.SerializeToString()
+        self._login_payload = (client_version, payload)
+        return payload
 
     async def heartbeat(self, gid: int, client_version: str) -> userpb_pb2.HeartbeatReply:
         req = userpb_pb2.HeartbeatRequest(
@@ -74,16 +77,18 @@ class UserService:
         share_cfg_id: int = 0,
         scene_id: str = "",
     ) -> userpb_pb2.ReportArkClickReply:
-        req = userpb_pb2.ReportArkClickRequest(
-            sharer_id=_to_int(sharer_id, 0),
-            sharer_open_id=str(sharer_open_id or ""),
-            share_cfg_id=_to_int(share_cfg_id, 0),
-            scene_id=str(scene_id or ""),
-        )
+        # 复用同一请求对象：序列化在首个 await 之前同步完成，并发调用之间不会互相覆盖。
+        req = self._ark_click_req
+        req.Clear()
+        req.sharer_id = _to_int(sharer_id, 0)
+        req.sharer_open_id = str(sharer_open_id or "")
+        req.share_cfg_id = _to_int(share_cfg_id, 0)
+        req.scene_id = str(scene_id or "")
+        payload = req.SerializeToString()
         body = await self.session.call(
             "gamepb.userpb.UserService",
             "ReportArkClick",
-            req.SerializeToString(),
+            payload,
             timeout_sec=self.rpc_timeout_sec,
         )
         reply = userpb_pb2.ReportArkClickReply()
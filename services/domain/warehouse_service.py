@@ -1,37 +1,41 @@
 from __future__ import annotations
 
 import asyncio
-from collections import OrderedDict
 from typing import Any
 
 from ..protocol.session import GatewaySession
 from ..protocol.proto import corepb_pb2, itempb_pb2
+from ._common import InflightCalls, _to_int, gather_bounded
 from .config_data import GameConfigData
 
-
-def _to_int(value: Any, default: int = 0) -> int:
-    try:
-        return int(value)
-    except Exception:
-        return int(default)
+_BAG_REQUEST = itempb_pb2.BagRequest().SerializeToString()
+_GOLD_ITEM_IDS = frozenset({1, 1001})
 
 
 class WarehouseService:
     SELL_BATCH_SIZE = 15
+    SELL_FALLBACK_CONCURRENCY = 4
     FERTILIZER_INTERACTION_TYPES = frozenset({"fertilizer", "fertilizerpro"})
 
     def __init__(self, session: GatewaySession, config_data: GameConfigData, *, rpc_timeout_sec: int = 10) -> None:
         self.session = session
         self.config_data = config_data
         self.rpc_timeout_sec = max(1, int(rpc_timeout_sec))
+        self._inflight = InflightCalls()
+        self._row_templates: dict[int, dict[str, Any]] = {}
+        self._fruit_ids: frozenset[int] = frozenset()
+        self._seed_ids: frozenset[int] = frozenset()
+        self._cache_source: tuple[Any, ...] | None = None
 
     async def get_bag(self) -> itempb_pb2.BagReply:
-        req = itempb_pb2.BagRequest()
-        body = await self.session.call(
-            "gamepb.itempb.ItemService",
+        body = await self._inflight.run(
             "Bag",
-            req.SerializeToString(),
-            timeout_sec=self.rpc_timeout_sec,
+            lambda: self.session.call(
+                "gamepb.itempb.ItemService",
+                "Bag",
+                _BAG_REQUEST,
+                timeout_sec=self.rpc_timeout_sec,
+            ),
         )
         reply = itempb_pb2.BagReply()
         reply.ParseFromString(body)
@@ -90,7 +94,7 @@ class WarehouseService:
     async def get_bag_detail(self) -> dict[str, Any]:
         reply = await self.get_bag()
         raw_items = self.get_bag_items(reply)
-        merged: OrderedDict[int, dict[str, Any]] = OrderedDict()
+        merged: dict[int, dict[str, Any]] = {}
         for item in raw_items:
             item_id = _to_int(item.id, 0)
             count = _to_int(item.count, 0)
@@ -98,21 +102,20 @@ class WarehouseService:
                 continue
             row = merged.get(item_id)
             if row is None:
-                row = self._build_item_row(item_id)
-                row["count"] = 0
+                row = self._item_row(item_id)
                 merged[item_id] = row
             row["count"] += count
 
         items = list(merged.values())
         for row in items:
-            interaction_type = str(row.get("interactionType") or "")
-            count = _to_int(row.get("count"), 0)
-            if interaction_type == "fertilizerbucket" and count > 0:
+            count = row["count"]
+            if row["interactionType"] == "fertilizerbucket" and count > 0:
                 hours_floor_1 = int((count / 3600.0) * 10) / 10
                 row["hoursText"] = f"{hours_floor_1:.1f}小时"
             else:
                 row["hoursText"] = ""
-        items.sort(key=lambda x: (-_to_int(x.get("count"), 0), _to_int(x.get("id"), 0)))
+        # 合并阶段已保证 id/count 为 int（行模板来自 _build_item_row），排序键直接取值。
+        items.sort(key=lambda x: (-x["count"], x["id"]))
         return {"totalKinds": len(items), "items": items}
 
     async def sell_all_fruits(self) -> dict[str, Any]:
@@ -139,22 +142,25 @@ class WarehouseService:
                 sold += len(batch)
                 gold_total += self._derive_gold_gain(reply)
             except Exception:
-                for row in batch:
-                    try:
-                        reply = await self.sell_items([row])
-                        sold += 1
-                        gold_total += self._derive_gold_gain(reply)
-                    except Exception:
-                        continue
-                    await asyncio.sleep(0.1)
+                gains = await self._sell_singles(batch)
+                sold += len(gains)
+                gold_total += sum(gains)
             if idx + self.SELL_BATCH_SIZE < len(targets):
                 await asyncio.sleep(0.3)
         return {"soldKinds": sold, "goldEarned": max(0, gold_total)}
 
+    async def _sell_singles(self, rows: list[dict[str, int]]) -> list[int]:
+        # 批量出售失败后逐条回退：各条相互独立，并发发出（受 SELL_FALLBACK_CONCURRENCY 限制）。
+        async def _one(row: dict[str, int]) -> int:
+            return self._derive_gold_gain(await self.sell_items([row]))
+
+        results = await gather_bounded(rows, _one, self.SELL_FALLBACK_CONCURRENCY)
+        return [r for r in results if not isinstance(r, Exception)]
+
     async def use_fertilizer_gifts(self) -> dict[str, Any]:
         bag_reply = await self.get_bag()
         raw_items = self.get_bag_items(bag_reply)
-        merged: OrderedDict[int, int] = OrderedDict()
+        merged: dict[int, int] = {}
         for item in list(raw_items or []):
             item_id = _to_int(getattr(item, "id", 0), 0)
             count = _to_int(getattr(item, "count", 0), 0)
@@ -254,11 +260,30 @@ class WarehouseService:
             return list(reply.item_bag.items or [])
         return []
 
+    def _ensure_caches(self) -> None:
+        # 物品/作物元数据是静态配置：按需构建一次索引，配置重载（各表被整体替换）时重建。
+        cfg = self.config_data
+        source = (cfg.item_by_id, cfg.plant_by_fruit, cfg.plant_by_seed)
+        if self._cache_source is not None and all(a is b for a, b in zip(source, self._cache_source)):
+            return
+        self._cache_source = source
+        self._row_templates = {}
+        self._fruit_ids = frozenset(cfg.plant_by_fruit)
+        self._seed_ids = frozenset(cfg.plant_by_seed)
+
+    def _item_row(self, item_id: int) -> dict[str, Any]:
+        self._ensure_caches()
+        template = self._row_templates.get(item_id)
+        if template is None:
+            template = self._build_item_row(item_id)
+            self._row_templates[item_id] = template
+        return dict(template)
+
     def _build_item_row(self, item_id: int) -> dict[str, Any]:
         item = self.config_data.get_item_by_id(item_id) or {}
         name = str(item.get("name") or "")
         category = "item"
-        if item_id in {1, 1001}:
+        if item_id in _GOLD_ITEM_IDS:
             name = "金币"
             category = "gold"
         elif item_id == 1101:
@@ -267,7 +292,7 @@ class WarehouseService:
         elif self._is_fruit_item(item_id):
             name = name or (self.config_data.get_fruit_name(item_id) + "果实")
             category = "fruit"
-        elif self.config_data.get_plant_by_seed(item_id):
+        elif item_id in self._seed_ids:
             name = name or (self.config_data.get_plant_name_by_seed(item_id) + "种子")
             category = "seed"
         if not name:
@@ -287,7 +312,8 @@ class WarehouseService:
         }
 
     def _is_fruit_item(self, item_id: int) -> bool:
-        return self.config_data.get_plant_by_fruit(item_id) is not None
+        self._ensure_caches()
+        return item_id in self._fruit_ids
 
     @staticmethod
     def _to_sell_item(row: dict[str, int]) -> corepb_pb2.Item:
@@ -300,9 +326,4 @@ class WarehouseService:
     @staticmethod
     def _derive_gold_gain(reply: itempb_pb2.SellReply) -> int:
         # 协议里通常 get_items 返回本次获得的金币（id=1001）。
-        gold = 0
-        for item in reply.get_items:
-            item_id = _to_int(item.id, 0)
-            if item_id in {1, 1001}:
-                gold += max(0, _to_int(item.count, 0))
-        return gold
+        return sum(max(0, item.count) for item in reply.get_items if item.id in _GOLD_ITEM_IDS)
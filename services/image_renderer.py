@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import os
 import time
 import uuid
 from pathlib import Path
@@ -9,6 +11,9 @@ from typing import Any
 import aiohttp
 
 
+_JSON_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+
+
 class QFarmImageRenderer:
     """qfarm 图片渲染客户端。"""
 
@@ -23,6 +28,7 @@ class QFarmImageRenderer:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.timeout_sec = max(1, int(timeout_sec))
+        self._timeout = aiohttp.ClientTimeout(total=self.timeout_sec)
         self.logger = logger
         self._session: aiohttp.ClientSession | None = None
 
@@ -42,9 +48,10 @@ class QFarmImageRenderer:
 
     async def render_qfarm(self, payload: dict[str, Any]) -> str | None:
         session = await self._ensure_session()
-        timeout = aiohttp.ClientTimeout(total=self.timeout_sec)
         try:
-            async with session.post(f"{self.service_url}/api/qfarm", json=payload, timeout=timeout) as resp:
+            # 紧凑分隔符 + 直接传字节：省去 aiohttp 的 json= 包装与多余空白。
+            data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            async with session.post(f"{self.service_url}/api/qfarm", data=data, headers=_JSON_HEADERS) as resp:
                 if resp.status != 200:
                     body = await resp.text()
                     self._log_warning(f"qfarm 渲染失败: HTTP {resp.status}, body={body[:240]}")
@@ -54,7 +61,8 @@ class QFarmImageRenderer:
                     self._log_warning("qfarm 渲染失败: 响应为空")
                     return None
                 image_path = self._allocate_image_path()
-                image_path.write_bytes(content)
+                # 落盘放到线程池，避免大图写入阻塞事件循环。
+                await asyncio.to_thread(image_path.write_bytes, content)
                 return str(image_path)
         except Exception as e:
             self._log_warning(f"qfarm 渲染请求异常: {e}")
@@ -64,21 +72,31 @@ class QFarmImageRenderer:
         now = time.time()
         removed = 0
         ttl = max(60, int(max_age_sec))
-        for path in self.cache_dir.glob("*.png"):
-            try:
-                if now - path.stat().st_mtime >= ttl:
-                    path.unlink(missing_ok=True)
-                    removed += 1
-            except Exception:
-                continue
+        try:
+            entries = os.scandir(self.cache_dir)
+        except OSError:
+            return 0
+        with entries:
+            for entry in entries:
+                if not entry.name.endswith(".png"):
+                    continue
+                try:
+                    if now - entry.stat().st_mtime >= ttl:
+                        os.unlink(entry.path)
+                        removed += 1
+                except Exception:
+                    continue
         return removed
 
     async def _ensure_session(self) -> aiohttp.ClientSession:
         if self._session and not self._session.closed:
             return self._session
+        # 渲染服务通常只有一个主机：长保活 + DNS 缓存，让连续渲染复用同一条连接。
+        connector = aiohttp.TCPConnector(limit=32, limit_per_host=16, keepalive_timeout=60, ttl_dns_cache=300)
         self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=self._timeout,
             headers={"User-Agent": "qfarm-renderer/1.0"},
-            json_serialize=lambda data: json.dumps(data, ensure_ascii=False),
         )
         return self._session
 
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 
 from google.protobuf.message import DecodeError
 
@@ -8,6 +10,47 @@ from .proto import game_pb2
 
 MAX_GATE_MESSAGE_BYTES = 512 * 1024
 
+# 解码全程同步、不跨 await，按线程复用消息对象即可省去每帧的 Message/EventMessage 分配；
+# 字段在返回前已拷贝进 GateMeta/GateMessage，复用对象不会泄漏到调用方。
+_TLS = threading.local()
+
+
+def _scratch() -> threading.local:
+    tls = _TLS
+    if not hasattr(tls, "message"):
+        tls.message = game_pb2.Message()
+        tls.event = game_pb2.EventMessage()
+    return tls
+
+
+# Message.meta = 1 / Message.body = 2（LEN），Meta.client_seq = 4 / Meta.server_seq = 5（varint）。
+_TAG_MESSAGE_META = b"\x0a"
+_TAG_MESSAGE_BODY = b"\x12"
+_TAG_META_CLIENT_SEQ = b"\x20"
+_TAG_META_SERVER_SEQ = b"\x28"
+
+
+def _varint(value: int) -> bytes:
+    value &= 0xFFFFFFFFFFFFFFFF
+    if value < 0x80:
+        return bytes((value,))
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+@lru_cache(maxsize=256)
+def _meta_prefix(service_name: str, method_name: str) -> bytes:
+    # 同一 RPC 的 service/method/message_type 恒定：只序列化一次，逐次请求仅追加 seq 字段。
+    return game_pb2.Meta(
+        service_name=service_name,
+        method_name=method_name,
+        message_type=game_pb2.Request,
+    ).SerializeToString()
+
 
 @dataclass(slots=True)
 class GateMeta:
@@ -34,22 +77,23 @@ def encode_request(
     client_seq: int,
     server_seq: int,
 ) -> bytes:
-    msg = game_pb2.Message(
-        meta=game_pb2.Meta(
-            service_name=service_name,
-            method_name=method_name,
-            message_type=game_pb2.Request,
-            client_seq=int(client_seq),
-            server_seq=int(server_seq),
-        ),
-        body=body or b"",
-    )
-    return msg.SerializeToString()
+    # 手工拼装与 SerializeToString 逐字节一致的输出（字段按编号升序、proto3 零值省略）。
+    meta = _meta_prefix(service_name, method_name)
+    client_seq = int(client_seq)
+    server_seq = int(server_seq)
+    if client_seq:
+        meta += _TAG_META_CLIENT_SEQ + _varint(client_seq)
+    if server_seq:
+        meta += _TAG_META_SERVER_SEQ + _varint(server_seq)
+    out = _TAG_MESSAGE_META + _varint(len(meta)) + meta
+    if body:
+        out += _TAG_MESSAGE_BODY + _varint(len(body)) + body
+    return out
 
 
 def decode_gate_message(data: bytes) -> GateMessage:
     raw_data = _validate_message_bytes(data, "gate")
-    raw = game_pb2.Message()
+    raw = _scratch().message
     try:
         raw.ParseFromString(raw_data)
     except DecodeError as e:
@@ -65,12 +109,27 @@ def decode_gate_message(data: bytes) -> GateMessage:
         error_code=int(raw.meta.error_code),
         error_message=raw.meta.error_message,
     )
-    return GateMessage(meta=meta, body=bytes(raw.body or b""))
+    return GateMessage(meta=meta, body=raw.body)
+
+
+def decode_gate_frame(data: bytes) -> tuple[int, int, int, int, str, bytes]:
+    # 会话收包热路径：只取 (message_type, client_seq, server_seq, error_code, error_text, body)，
+    # 不构造 GateMeta/GateMessage；字符串字段仅在 error_code 非零时才读取并拼成错误描述。
+    raw_data = _validate_message_bytes(data, "gate")
+    raw = _scratch().message
+    try:
+        raw.ParseFromString(raw_data)
+    except DecodeError as e:
+        raise ValueError(f"invalid gate message: {e}") from e
+    meta = raw.meta
+    error_code = meta.error_code
+    error_text = f"{meta.service_name}.{meta.method_name} error={error_code} {meta.error_message}" if error_code else ""
+    return meta.message_type, meta.client_seq, meta.server_seq, error_code, error_text, raw.body
 
 
 def decode_event_message(data: bytes) -> tuple[str, bytes]:
     raw_data = _validate_message_bytes(data, "event")
-    event = game_pb2.EventMessage()
+    event = _scratch().event
     try:
         event.ParseFromString(raw_data)
     except DecodeError as e:
@@ -78,11 +137,12 @@ def decode_event_message(data: bytes) -> tuple[str, bytes]:
     message_type = str(event.message_type or "").strip()
     if not message_type:
         raise ValueError("event message missing message_type")
-    return message_type, bytes(event.body or b"")
+    return message_type, event.body
 
 
 def _validate_message_bytes(data: bytes, label: str) -> bytes:
-    raw = bytes(data or b"")
+    # aiohttp 的 BINARY 帧本身就是 bytes，直接使用；仅在 bytearray/memoryview/None 时才转换。
+    raw = data if type(data) is bytes else bytes(data or b"")
     size = len(raw)
     if size > MAX_GATE_MESSAGE_BYTES:
         raise ValueError(f"{label} message too large: {size} > {MAX_GATE_MESSAGE_BYTES}")
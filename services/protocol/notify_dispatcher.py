@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
 from collections.abc import Awaitable, Callable
 from typing import Any
 
@@ -10,30 +9,35 @@ NotifyHandler = Callable[[str, bytes], Awaitable[None] | None]
 
 class NotifyDispatcher:
     def __init__(self) -> None:
-        self._handlers: dict[str, list[NotifyHandler]] = defaultdict(list)
-        self._wildcard_handlers: list[NotifyHandler] = []
+        # 写时复制：处理器列表以元组保存，on/off/clear 在锁内整体替换，emit 直接读取当前元组而无需加锁。
+        self._handlers: dict[str, tuple[NotifyHandler, ...]] = {}
+        self._wildcard_handlers: tuple[NotifyHandler, ...] = ()
         self._lock = asyncio.Lock()
 
     async def on(self, message_type: str, handler: NotifyHandler) -> None:
         async with self._lock:
             if message_type == "*":
-                self._wildcard_handlers.append(handler)
+                self._wildcard_handlers = (*self._wildcard_handlers, handler)
             else:
-                self._handlers[str(message_type)].append(handler)
+                key = str(message_type)
+                self._handlers = {**self._handlers, key: (*self._handlers.get(key, ()), handler)}
 
     async def off(self, message_type: str, handler: NotifyHandler) -> None:
         async with self._lock:
             if message_type == "*":
-                self._wildcard_handlers = [h for h in self._wildcard_handlers if h is not handler]
+                self._wildcard_handlers = tuple(h for h in self._wildcard_handlers if h is not handler)
                 return
             key = str(message_type)
-            handlers = self._handlers.get(key, [])
-            self._handlers[key] = [h for h in handlers if h is not handler]
+            remaining = tuple(h for h in self._handlers.get(key, ()) if h is not handler)
+            handlers = dict(self._handlers)
+            if remaining:
+                handlers[key] = remaining
+            else:
+                handlers.pop(key, None)
+            self._handlers = handlers
 
     async def emit(self, message_type: str, payload: bytes) -> None:
-        async with self._lock:
-            handlers = list(self._handlers.get(message_type, []))
-            handlers.extend(self._wildcard_handlers)
+        handlers = self._handlers.get(message_type, ()) + self._wildcard_handlers
         for handler in handlers:
             try:
                 ret = handler(message_type, payload)
@@ -44,5 +48,5 @@ class NotifyDispatcher:
 
     async def clear(self) -> None:
         async with self._lock:
-            self._handlers.clear()
-            self._wildcard_handlers.clear()
+            self._handlers = {}
+            self._wildcard_handlers = ()
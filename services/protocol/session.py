@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import socket
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from typing import Any
@@ -8,7 +9,7 @@ from urllib.parse import urlencode
 
 import aiohttp
 
-from .gate_codec import decode_event_message, decode_gate_message, encode_request
+from .gate_codec import decode_event_message, decode_gate_frame, encode_request
 from .notify_dispatcher import NotifyDispatcher
 
 
@@ -26,6 +27,8 @@ class GatewaySessionConfig:
     os: str = "iOS"
     client_version: str = "1.6.0.5_20251224"
     rpc_timeout_sec: int = 10
+    # WS 层保活间隔；所有 RPC 复用同一条长连接按 client_seq 多路并发，无需逐次建连。
+    ws_heartbeat_sec: float = 30
     user_agent: str = (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
         "(KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36 "
@@ -35,6 +38,29 @@ class GatewaySessionConfig:
     origin: str = "https://gate-obt.nqf.qq.com"
 
 
+def _tune_socket(ws: Any) -> None:
+    # RPC 帧普遍很小：确保关闭 Nagle（aiohttp 默认已关，这里仅兜底），并开启 TCP keepalive 尽早发现死连接。
+    # 各平台支持的选项不同，缺失或设置失败时静默跳过。
+    get_extra_info = getattr(ws, "get_extra_info", None)
+    sock = get_extra_info("socket") if callable(get_extra_info) else None
+    if sock is None:
+        return
+    options = [
+        (socket.IPPROTO_TCP, getattr(socket, "TCP_NODELAY", None), 1),
+        (socket.SOL_SOCKET, getattr(socket, "SO_KEEPALIVE", None), 1),
+        (socket.IPPROTO_TCP, getattr(socket, "TCP_KEEPIDLE", None), 30),
+        (socket.IPPROTO_TCP, getattr(socket, "TCP_KEEPINTVL", None), 10),
+        (socket.IPPROTO_TCP, getattr(socket, "TCP_KEEPCNT", None), 3),
+    ]
+    for level, name, value in options:
+        if name is None:
+            continue
+        try:
+            sock.setsockopt(level, name, value)
+        except OSError:
+            continue
+
+
 class GatewaySession:
     def __init__(
         self,
@@ -48,6 +74,9 @@ class GatewaySession:
         self._http: aiohttp.ClientSession | None = None
         self._ws: aiohttp.ClientWebSocketResponse | None = None
         self._recv_task: asyncio.Task | None = None
+        # 1 秒粒度的超时时间轮：到期秒 -> 该秒到期的请求序号，由 _sweep_timeouts 经 _pending 统一清扫。
+        self._timeout_buckets: dict[int, list[int]] = {}
+        self._sweep_task: asyncio.Task | None = None
 
         self._client_seq = 1
         self._server_seq = 0
@@ -73,13 +102,14 @@ class GatewaySession:
         self._closed = False
         self._client_seq = 1
         self._server_seq = 0
-        self._pending.clear()
+        # 上一轮连接遗留的未决请求先明确失败再丢弃，避免调用方永久挂起。
+        await self._fail_all_pending("session restarted")
         self._http = aiohttp.ClientSession(headers={"User-Agent": self.config.user_agent})
         url = self._build_ws_url(code=code)
         try:
             self._ws = await self._http.ws_connect(
                 url,
-                heartbeat=30,
+                heartbeat=self.config.ws_heartbeat_sec,
                 origin=self.config.origin,
                 autoclose=True,
                 autoping=True,
@@ -93,6 +123,7 @@ class GatewaySession:
                     "websocket connect failed: 网关鉴权失败(HTTP 400)，登录凭据可能已失效"
                 ) from e
             raise GatewaySessionError(f"websocket connect failed: {e}") from e
+        _tune_socket(self._ws)
         self._recv_task = asyncio.create_task(self._recv_loop())
 
     async def stop(self) -> None:
@@ -119,7 +150,11 @@ class GatewaySession:
             self._disconnect_handlers = [handler] if callable(handler) else []
 
     async def call(self, service: str, method: str, body: bytes, timeout_sec: int | None = None) -> bytes:
-        if not self.connected:
+        """发送一次 RPC 并等待回包。
+
+        超时按 1 秒粒度的时间轮判定，只会晚到不会提前：实际失败时间在 timeout_sec 之后至多约 2 秒。
+        """
+        if self._closed or not self.connected:
             raise GatewaySessionError("websocket is not connected")
         timeout = max(1, int(timeout_sec or self.config.rpc_timeout_sec))
         async with self._send_lock:
@@ -132,18 +167,52 @@ class GatewaySession:
                 client_seq=seq,
                 server_seq=self._server_seq,
             )
-            fut: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+            loop = asyncio.get_running_loop()
+            fut: asyncio.Future[bytes] = loop.create_future()
             self._pending[seq] = fut
             ws = self._ws
-            if ws is None or ws.closed:
+            if self._closed or ws is None or ws.closed:
                 self._pending.pop(seq, None)
                 raise GatewaySessionError("websocket is closed")
-            await ws.send_bytes(payload)
+            try:
+                await ws.send_bytes(payload)
+            except BaseException:
+                self._pending.pop(seq, None)
+                raise
+        # 发送期间会话已关闭时 _hard_close 已令 future 失败，不再登记超时桶。
+        if not self._closed:
+            # 超时不再逐次 call_later：按到期秒（向上取整，只会略晚不会提前）归桶，由清扫协程批量置位。
+            expiry = int(loop.time() + timeout) + 1
+            bucket = self._timeout_buckets.get(expiry)
+            if bucket is None:
+                self._timeout_buckets[expiry] = [seq]
+            else:
+                bucket.append(seq)
+            if self._sweep_task is None:
+                self._sweep_task = asyncio.create_task(self._sweep_timeouts())
         try:
-            return await asyncio.wait_for(fut, timeout=timeout)
+            return await fut
         except asyncio.TimeoutError as e:
-            self._pending.pop(seq, None)
             raise GatewaySessionError(f"request timeout: {service}.{method}") from e
+        finally:
+            self._pending.pop(seq, None)
+
+    async def _sweep_timeouts(self) -> None:
+        # 仅在有在途请求时运行：每秒醒来一次，弹出已到期的桶；桶清空后自行退出，空闲连接不常驻定时任务。
+        loop = asyncio.get_running_loop()
+        buckets = self._timeout_buckets
+        try:
+            while buckets:
+                await asyncio.sleep(1.0)
+                now = loop.time()
+                for expiry in [key for key in buckets if key <= now]:
+                    for seq in buckets.pop(expiry):
+                        fut = self._pending.get(seq)
+                        if fut is not None and not fut.done():
+                            fut.set_exception(asyncio.TimeoutError())
+        finally:
+            if self._sweep_task is asyncio.current_task():
+                self._sweep_task = None
 
     async def _recv_loop(self) -> None:
         ws = self._ws
@@ -154,7 +223,7 @@ class GatewaySession:
             async for msg in ws:
                 if msg.type == aiohttp.WSMsgType.BINARY:
                     try:
-                        await self._handle_binary(bytes(msg.data))
+                        await self._handle_binary(msg.data)
                     except Exception as e:
                         self._log_warning(f"decode binary message failed: {e}")
                         continue
@@ -184,29 +253,23 @@ class GatewaySession:
                 await self._close_from_recv_loop()
 
     async def _handle_binary(self, data: bytes) -> None:
-        parsed = decode_gate_message(data)
-        if parsed.meta.server_seq > self._server_seq:
-            self._server_seq = parsed.meta.server_seq
+        message_type, client_seq, server_seq, error_code, error_text, body = decode_gate_frame(data)
+        if server_seq > self._server_seq:
+            self._server_seq = server_seq
 
-        if parsed.meta.message_type == 2:
-            seq = parsed.meta.client_seq
-            fut = self._pending.pop(seq, None)
+        if message_type == 2:
+            fut = self._pending.pop(client_seq, None)
             if fut is None or fut.done():
                 return
-            if parsed.meta.error_code != 0:
-                fut.set_exception(
-                    GatewaySessionError(
-                        f"{parsed.meta.service_name}.{parsed.meta.method_name} "
-                        f"error={parsed.meta.error_code} {parsed.meta.error_message}"
-                    )
-                )
+            if error_code != 0:
+                fut.set_exception(GatewaySessionError(error_text))
                 return
-            fut.set_result(parsed.body)
+            fut.set_result(body)
             return
 
-        if parsed.meta.message_type == 3:
+        if message_type == 3:
             try:
-                event_type, event_body = decode_event_message(parsed.body)
+                event_type, event_body = decode_event_message(body)
                 await self.notify_dispatcher.emit(event_type, event_body)
             except Exception:
                 return
@@ -224,6 +287,13 @@ class GatewaySession:
 
     async def _hard_close(self, *, called_from_recv: bool = False) -> None:
         self._closed = True
+        sweep_task = self._sweep_task
+        self._sweep_task = None
+        if sweep_task is not None and not sweep_task.done():
+            sweep_task.cancel()
+        # 清扫协程已取消：桶中只有序号，未完成的请求都在 _pending 中，须在此失败，否则调用方会永久等待。
+        self._timeout_buckets.clear()
+        await self._fail_all_pending("session closed")
         recv_task = self._recv_task
         self._recv_task = None
         current = asyncio.current_task()
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-import io
+import hashlib
+import os
+import struct
 import time
 import uuid
+import zlib
+from functools import lru_cache
 from pathlib import Path
 
 import segno
@@ -12,6 +16,34 @@ class QRCodeRenderError(RuntimeError):
     """Raised when local QR code render/save fails."""
 
 
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# 放大 8 倍且为 1 位灰度时，每个模块恰好占 1 字节：暗模块 0x00（黑）、亮模块 0xFF（白）。
+_QR_SCALE = 8
+_QR_BORDER = 2
+_MODULE_BYTES = bytes([0xFF] + [0x00] * 255)
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def _encode_matrix_png(matrix: tuple[bytearray, ...]) -> bytes:
+    # 直接按字节拼扫描线再交给 zlib（C 实现）压缩，省去 segno 纯 Python 的逐像素 PNG 写出。
+    size = len(matrix) + 2 * _QR_BORDER
+    pad = b"\xff" * _QR_BORDER
+    light_line = b"\x00" + b"\xff" * size
+    quiet = light_line * (_QR_BORDER * _QR_SCALE)
+    rows = b"".join((b"\x00" + pad + bytes(row).translate(_MODULE_BYTES) + pad) * _QR_SCALE for row in matrix)
+    width = size * _QR_SCALE
+    header = struct.pack(">IIBBBBB", width, width, 1, 0, 0, 0, 0)
+    return (
+        _PNG_SIGNATURE
+        + _png_chunk(b"IHDR", header)
+        + _png_chunk(b"IDAT", zlib.compress(quiet + rows + quiet, 9))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
 def render_png_bytes(content: str) -> bytes:
     text = str(content or "").strip()
     if not text:
@@ -19,28 +51,43 @@ def render_png_bytes(content: str) -> bytes:
 
     try:
         qr = segno.make(text, error="m")
-        buffer = io.BytesIO()
-        qr.save(buffer, kind="png", scale=8, border=2, dark="#000000", light="#ffffff")
-        payload = buffer.getvalue()
+        payload = _encode_matrix_png(qr.matrix)
     except Exception as e:  # pragma: no cover - depends on segno internals
         raise QRCodeRenderError(f"二维码生成失败: {e}") from e
 
-    if not payload.startswith(b"\x89PNG\r\n\x1a\n"):
+    if not payload.startswith(_PNG_SIGNATURE):
         raise QRCodeRenderError("二维码生成失败: 非 PNG 数据")
     return payload
 
 
-def save_qr_png(content: str, cache_dir: Path) -> str:
+@lru_cache(maxsize=64)
+def _render_cached(text: str) -> bytes:
+    return render_png_bytes(text)
+
+
+def save_qr_png(content: str, cache_dir: Path, *, ttl_sec: int = 0) -> str:
     target_dir = Path(cache_dir)
     try:
         target_dir.mkdir(parents=True, exist_ok=True)
     except Exception as e:
         raise QRCodeRenderError(f"二维码目录创建失败: {e}") from e
 
-    payload = render_png_bytes(content)
-    ts = int(time.time() * 1000)
-    token = uuid.uuid4().hex[:10]
-    path = target_dir / f"qfarm_qr_{ts}_{token}.png"
+    if ttl_sec <= 0:
+        payload = render_png_bytes(content)
+        ts = int(time.time() * 1000)
+        token = uuid.uuid4().hex[:10]
+        path = target_dir / f"qfarm_qr_{ts}_{token}.png"
+    else:
+        # 按内容哈希命名：同一登录链接在 TTL 内重复生成时直接复用已有文件，跳过渲染与写盘。
+        text = str(content or "").strip()
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+        path = target_dir / f"qfarm_qr_{key}.png"
+        try:
+            if time.time() - path.stat().st_mtime < ttl_sec:
+                return str(path)
+        except OSError:
+            pass
+        payload = _render_cached(text)
     try:
         path.write_bytes(payload)
     except Exception as e:
@@ -56,11 +103,17 @@ def cleanup_qr_cache(cache_dir: Path, ttl_sec: int) -> int:
     now = time.time()
     safe_ttl = max(60, int(ttl_sec))
     removed = 0
-    for path in target_dir.glob("*.png"):
-        try:
-            if now - path.stat().st_mtime >= safe_ttl:
-                path.unlink(missing_ok=True)
-                removed += 1
-        except Exception:
-            continue
+    try:
+        with os.scandir(target_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".png"):
+                    continue
+                try:
+                    if now - entry.stat(follow_symlinks=False).st_mtime >= safe_ttl:
+                        os.unlink(entry.path)
+                        removed += 1
+                except Exception:
+                    continue
+    except OSError:
+        return removed
     return removed
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import re
 from dataclasses import dataclass
 from typing import Any
@@ -50,13 +51,31 @@ class QFarmQRLogin:
     def __init__(self, config: QRLoginConfig | None = None) -> None:
         self.config = config or QRLoginConfig()
         self._timeout = aiohttp.ClientTimeout(total=max(5, int(self.config.timeout_sec)))
+        self._session: aiohttp.ClientSession | None = None
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # 扫码轮询每隔几秒一次：复用同一会话/连接池，避免每次重新握手 TLS。
+        # 请求头按调用传入；PC 模式显式携带 qrsig Cookie，故禁用 cookie jar 以保持各请求互不影响。
+        if self._session and not self._session.closed:
+            return self._session
+        self._session = aiohttp.ClientSession(
+            timeout=self._timeout,
+            connector=aiohttp.TCPConnector(limit=16, ttl_dns_cache=300),
+            cookie_jar=aiohttp.DummyCookieJar(),
+        )
+        return self._session
 
     # ---- MiniApp (legacy behavior) ----
     async def request_login_code(self) -> dict[str, Any]:
         url = "https://q.qq.com/ide/devtoolAuth/GetLoginCode"
-        async with aiohttp.ClientSession(timeout=self._timeout, headers=self._miniapp_headers()) as session:
-            async with session.get(url) as resp:
-                data = await self._read_json(resp)
+        session = await self._get_session()
+        async with session.get(url, headers=self._miniapp_headers()) as resp:
+            data = await self._read_json(resp)
 
         if _to_int(data.get("code"), -1) != 0:
             raise QRLoginError("failed to get miniapp login code")
@@ -78,11 +97,11 @@ class QFarmQRLogin:
             "https://q.qq.com/ide/devtoolAuth/syncScanSateGetTicket"
             f"?code={aiohttp.helpers.quote(code_text, safe='')}"
         )
-        async with aiohttp.ClientSession(timeout=self._timeout, headers=self._miniapp_headers()) as session:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    return {"status": "Error", "msg": f"HTTP {resp.status}"}
-                data = await self._read_json(resp)
+        session = await self._get_session()
+        async with session.get(url, headers=self._miniapp_headers()) as resp:
+            if resp.status != 200:
+                return {"status": "Error", "msg": f"HTTP {resp.status}"}
+            data = await self._read_json(resp)
 
         res_code = _to_int(data.get("code"), -1)
         payload = data.get("data", {}) if isinstance(data, dict) else {}
@@ -105,11 +124,11 @@ class QFarmQRLogin:
 
         url = "https://q.qq.com/ide/login"
         payload = {"appid": self.config.appid, "ticket": ticket_text}
-        async with aiohttp.ClientSession(timeout=self._timeout, headers=self._miniapp_headers()) as session:
-            async with session.post(url, json=payload) as resp:
-                if resp.status != 200:
-                    return ""
-                data = await self._read_json(resp)
+        session = await self._get_session()
+        async with session.post(url, json=payload, headers=self._miniapp_headers()) as resp:
+            if resp.status != 200:
+                return ""
+            data = await self._read_json(resp)
         return str(data.get("code") or "")
 
     # ---- Unified API ----
@@ -190,12 +209,12 @@ class QFarmQRLogin:
             "Referer": self.config.pc_referrer or "https://xui.ptlogin2.qq.com/",
             "User-Agent": CHROME_UA,
         }
-        async with aiohttp.ClientSession(timeout=self._timeout, headers=headers) as session:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    raise QRLoginError(f"failed to get pc qrcode: HTTP {resp.status}")
-                qrcode_png = await resp.read()
-                qrsig = _extract_cookie_value(resp.headers.getall("Set-Cookie", []), "qrsig")
+        session = await self._get_session()
+        async with session.get(url, headers=headers) as resp:
+            if resp.status != 200:
+                raise QRLoginError(f"failed to get pc qrcode: HTTP {resp.status}")
+            qrcode_png = await resp.read()
+            qrsig = _extract_cookie_value(resp.headers.getall("Set-Cookie", []), "qrsig")
 
         if not qrsig:
             raise QRLoginError("failed to get qrsig from pc qrcode response")
@@ -304,12 +323,12 @@ class QFarmQRLogin:
             "Referer": self.config.pc_referrer or "https://xui.ptlogin2.qq.com/",
             "User-Agent": CHROME_UA,
         }
-        async with aiohttp.ClientSession(timeout=self._timeout, headers=headers) as session:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    return {"status": "Error", "msg": f"HTTP {resp.status}"}
-                text = await resp.text(errors="ignore")
-                cookies = resp.headers.getall("Set-Cookie", [])
+        session = await self._get_session()
+        async with session.get(url, headers=headers) as resp:
+            if resp.status != 200:
+                return {"status": "Error", "msg": f"HTTP {resp.status}"}
+            text = await resp.text(errors="ignore")
+            cookies = resp.headers.getall("Set-Cookie", [])
         return _parse_pc_login_status(text, cookies)
 
     def _miniapp_headers(self) -> dict[str, str]:
@@ -323,8 +342,9 @@ class QFarmQRLogin:
 
     @staticmethod
     async def _read_json(resp: aiohttp.ClientResponse) -> dict[str, Any]:
+        # 直接从字节解析（json.loads 自行识别 UTF-8/16/32），跳过 aiohttp 的 content-type 检查与字符集探测。
         try:
-            data = await resp.json(content_type=None)
+            data = json.loads(await resp.read())
         except Exception as e:
             raise QRLoginError(f"qr endpoint returned invalid json: {e}") from e
         if isinstance(data, dict):
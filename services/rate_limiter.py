@@ -26,6 +26,8 @@ class _RateLease:
 class RateLimiter:
     """三级控制：用户冷却、全局并发、账号写串行。"""
 
+    MAX_TRACKED_USERS = 10_000
+
     def __init__(
         self,
         read_cooldown_sec: float = 1.0,
@@ -38,9 +40,10 @@ class RateLimiter:
         self.account_write_serialized = bool(account_write_serialized)
         self._global_sem = asyncio.Semaphore(max(1, int(global_concurrency)))
 
-        self._state_lock = asyncio.Lock()
         self._next_read_ts: dict[str, float] = {}
         self._next_write_ts: dict[str, float] = {}
+        # 读/写冷却表上次清理后存活条目数的两倍，作为下一次清理的额外门槛，保证清理摊还 O(1)。
+        self._prune_floor = {False: 0, True: 0}
         self._account_locks: dict[str, asyncio.Lock] = {}
 
     async def acquire(self, user_id: str | int, is_write: bool, account_id: str | int | None = None) -> _RateLease:
@@ -53,12 +56,22 @@ class RateLimiter:
         tracking = self._next_write_ts if is_write else self._next_read_ts
         cmd_type = "写操作" if is_write else "读操作"
 
-        async with self._state_lock:
-            next_ts = float(tracking.get(uid, 0.0))
-            if next_ts > now:
-                wait_sec = max(0.1, next_ts - now)
-                raise RateLimitError(f"{cmd_type}过于频繁，请 {wait_sec:.1f}s 后再试。")
-            tracking[uid] = now + cooldown
+        # 冷却检查与账号锁查找都不含 await，在单线程事件循环里天然原子，无需额外的状态锁。
+        # 信号量/账号锁在无竞争时 acquire 也会直接返回，不会让出调度。
+        next_ts = tracking.get(uid, 0.0)
+        if next_ts > now:
+            wait_sec = max(0.1, next_ts - now)
+            raise RateLimitError(f"{cmd_type}过于频繁，请 {wait_sec:.1f}s 后再试。")
+        tracking[uid] = now + cooldown
+        if len(tracking) > max(self.MAX_TRACKED_USERS, self._prune_floor[is_write]):
+            # 已过冷却期的条目与不存在等价，超限时重建字典剔除之，避免长期运行下按用户数无限增长。
+            # 存活条目仍很多时把阈值抬到存活数的两倍，避免每次 acquire 都全表重建。
+            tracking = {key: ts for key, ts in tracking.items() if ts > now}
+            self._prune_floor[is_write] = 2 * len(tracking)
+            if is_write:
+                self._next_write_ts = tracking
+            else:
+                self._next_read_ts = tracking
 
         account_lock = None
         acquired_global = False
@@ -70,8 +83,9 @@ class RateLimiter:
             if is_write and self.account_write_serialized and account_id is not None:
                 aid = str(account_id).strip()
                 if aid:
-                    async with self._state_lock:
-                        account_lock = self._account_locks.setdefault(aid, asyncio.Lock())
+                    account_lock = self._account_locks.get(aid)
+                    if account_lock is None:
+                        account_lock = self._account_locks[aid] = asyncio.Lock()
                     await account_lock.acquire()
                     acquired_account_lock = True
 
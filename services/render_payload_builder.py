@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import datetime as dt
 import re
+from functools import lru_cache
 from typing import Any
 
-ALLOWED_THEMES = {"dark", "light"}
+ALLOWED_THEMES = frozenset(("dark", "light"))
 
 TEXT_ONLY_PREFIXES = (
     "用法:",
@@ -23,6 +24,11 @@ TEXT_ONLY_KEYWORDS = (
     "白名单",
 )
 
+_NUL_TABLE = {0: None}
+_EMPTY_TEXT = "暂无可展示内容。"
+_TITLE_RE = re.compile(r"^【(.+?)】$")
+_TEXT_ONLY_KEYWORD_RE = re.compile("|".join(map(re.escape, TEXT_ONLY_KEYWORDS)))
+
 
 def build_qfarm_payload_pages(
     text: str,
@@ -31,10 +37,45 @@ def build_qfarm_payload_pages(
     icon: str = "🌾",
     footer: str = "astrbot_plugin_qfarm",
 ) -> list[dict[str, Any]]:
-    lines = [_clip_line(_normalize_line(line)) for line in str(text or "").splitlines()]
-    lines = [line for line in lines if line]
+    return _build_pages(str(text or ""), theme=theme, icon=icon, footer=footer)
+
+
+def prepare_qfarm_render(
+    text: str,
+    *,
+    theme: str = "light",
+    icon: str = "🌾",
+    footer: str = "astrbot_plugin_qfarm",
+) -> tuple[bool, list[dict[str, Any]]]:
+    content = str(text or "").strip()
+    if not _is_renderable(content):
+        return False, []
+    return True, _build_pages(content, theme=theme, icon=icon, footer=footer)
+
+
+def _build_pages(
+    text: str,
+    *,
+    theme: str,
+    icon: str,
+    footer: str,
+) -> list[dict[str, Any]]:
+    line = text.strip() if len(text) < 120 and text.isprintable() else ""
+    if line and not line.startswith("【") and not _looks_like_list_item(line):
+        title, summary, stats, rows, page_size = "QFarm 结果", line, (), (("", line),), 22
+    else:
+        title, summary, stats, rows, page_size = _layout_rows(text)
+    return _format_pages(title, summary, stats, rows, page_size, theme=theme, icon=icon, footer=footer)
+
+
+@lru_cache(maxsize=256)
+def _layout_rows(text: str) -> tuple[str, str, tuple[tuple[str, str], ...], tuple[tuple[str, str], ...], int]:
+    # 缓存的 stats/rows 以不可变元组保存，_format_pages 每次渲染都重新构建行字典。
+    if "\x00" in text:
+        text = text.translate(_NUL_TABLE)
+    lines = [line if len(line) <= 120 else line[:117] + "..." for line in map(str.strip, text.splitlines()) if line]
     if not lines:
-        lines = ["暂无可展示内容。"]
+        return "QFarm 结果", _EMPTY_TEXT, (), (("", _EMPTY_TEXT),), 22
 
     title, body_lines = _extract_title(lines)
     summary = ""
@@ -42,61 +83,91 @@ def build_qfarm_payload_pages(
         summary = body_lines[0]
         body_lines = body_lines[1:]
 
-    stats: list[dict[str, str]] = []
-    rows: list[dict[str, str]] = []
+    stats: list[tuple[str, str]] = []
+    rows: list[tuple[str, str]] = []
     for raw in body_lines:
         key, value = _split_key_value(raw)
         if key and value and len(key) <= 8 and len(value) <= 24 and len(stats) < 10:
-            stats.append({"label": _clip_line(key, 16), "value": _clip_line(value, 48)})
+            stats.append((_clip_line(key, 16), _clip_line(value, 48)))
             continue
         if key and value:
-            rows.append({"label": _clip_line(key, 20), "value": _clip_line(value, 120)})
+            rows.append((_clip_line(key, 20), _clip_line(value, 120)))
             continue
-        rows.append({"value": _clip_line(raw, 120)})
+        rows.append(("", _clip_line(raw, 120)))
 
     if not rows and summary:
-        rows = [{"value": summary}]
+        rows = [("", summary)]
 
     page_size = 16 if _is_log_message(title, lines) else 22
-    row_chunks = _chunk_rows(rows, page_size) if rows else [[]]
-    total_pages = len(row_chunks)
-    now_text = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    normalized_theme = str(theme or "light").strip().lower()
-    if normalized_theme not in ALLOWED_THEMES:
-        normalized_theme = "light"
-
-    payloads: list[dict[str, Any]] = []
-    for index, chunk in enumerate(row_chunks, start=1):
-        payloads.append(
-            {
-                "title": title,
-                "subtitle": now_text,
-                "icon": icon,
-                "theme": normalized_theme,
-                "summary": summary if index == 1 else "",
-                "stats": stats if index == 1 else [],
-                "sections": [{"title": "详情", "rows": chunk}] if chunk else [],
-                "page": {"index": index, "total": total_pages},
-                "footer": footer,
-            }
-        )
-    return payloads
+    return title, summary, tuple(stats), tuple(rows), page_size
+
+
+def _format_pages(
+    title: str,
+    summary: str,
+    stats: tuple[tuple[str, str], ...],
+    rows: tuple[tuple[str, str], ...],
+    page_size: int,
+    *,
+    theme: str,
+    icon: str,
+    footer: str,
+) -> list[dict[str, Any]]:
+    page_size = max(1, page_size)
+    row_dicts = [{"label": label, "value": value} if label else {"value": value} for label, value in rows]
+    starts = range(0, len(rows) or 1, page_size)
+    total_pages = len(starts)
+    n = dt.datetime.now()
+    now_text = f"{n.year:04d}-{n.month:02d}-{n.day:02d} {n.hour:02d}:{n.minute:02d}:{n.second:02d}"
+    if theme in ALLOWED_THEMES:
+        normalized_theme = theme
+    else:
+        normalized_theme = str(theme or "light").strip().lower()
+        if normalized_theme not in ALLOWED_THEMES:
+            normalized_theme = "light"
+
+    proto: dict[str, Any] = {
+        "title": title,
+        "subtitle": now_text,
+        "icon": icon,
+        "theme": normalized_theme,
+        "summary": "",
+        "stats": None,
+        "sections": None,
+        "page": None,
+        "footer": footer,
+    }
+    return [
+        {
+            **proto,
+            "summary": summary if index == 1 else "",
+            "stats": [{"label": label, "value": value} for label, value in stats] if index == 1 else [],
+            "sections": _detail_sections(row_dicts[start : start + page_size]),
+            "page": {"index": index, "total": total_pages},
+        }
+        for index, start in enumerate(starts, start=1)
+    ]
+
+
+def _detail_sections(chunk: list[dict[str, str]]) -> list[dict[str, Any]]:
+    return [{"title": "详情", "rows": chunk}] if chunk else []
 
 
 def should_render_qfarm_image(text: str) -> bool:
-    content = str(text or "").strip()
+    return _is_renderable(str(text or "").strip())
+
+
+def _is_renderable(content: str) -> bool:
     if not content:
         return False
-    if any(content.startswith(prefix) for prefix in TEXT_ONLY_PREFIXES):
+    if content.startswith(TEXT_ONLY_PREFIXES):
         return False
-    if any(keyword in content for keyword in TEXT_ONLY_KEYWORDS):
-        return False
-    return True
+    return _TEXT_ONLY_KEYWORD_RE.search(content) is None
 
 
 def _extract_title(lines: list[str]) -> tuple[str, list[str]]:
     first = lines[0]
-    m = re.match(r"^【(.+?)】$", first)
+    m = _TITLE_RE.match(first)
     if m:
         return _clip_line(m.group(1), 40), lines[1:]
     return "QFarm 结果", lines
@@ -105,40 +176,41 @@ def _extract_title(lines: list[str]) -> tuple[str, list[str]]:
 def _is_log_message(title: str, lines: list[str]) -> bool:
     if "日志" in title:
         return True
-    joined = "\n".join(lines[:6])
-    return "日志" in joined or "log" in joined.lower()
-
-
-def _chunk_rows(rows: list[dict[str, str]], size: int) -> list[list[dict[str, str]]]:
-    if size <= 0:
-        size = 1
-    return [rows[i : i + size] for i in range(0, len(rows), size)]
+    for line in lines[:6]:
+        if "日志" in line or "log" in line.lower():
+            return True
+    return False
 
 
 def _split_key_value(line: str) -> tuple[str, str]:
-    clean = line.lstrip("- ").strip()
+    clean = line[2:].strip() if line.startswith("- ") else line
     if not clean:
         return "", ""
-    for sep in ("：", ":"):
-        if sep in clean:
-            key, value = clean.split(sep, 1)
-            return key.strip(), value.strip()
-    return "", ""
+    key, sep, value = clean.partition("：")
+    if not sep:
+        key, sep, value = clean.partition(":")
+        if not sep:
+            return "", ""
+    return key.strip(), value.strip()
 
 
-def _looks_like_list_item(line: str) -> bool:
-    text = line.strip()
+def _looks_like_list_item(text: str) -> bool:
     if text.startswith("- "):
         return True
-    return bool(re.match(r"^\d+\.\s*", text))
-
-
-def _normalize_line(value: str) -> str:
-    return str(value or "").replace("\u0000", "").strip()
+    if not text or not text[0].isdecimal():
+        return False
+    i = 1
+    size = len(text)
+    while i < size and text[i].isdecimal():
+        i += 1
+    return i < size and text[i] == "."
 
 
 def _clip_line(value: str, limit: int = 120) -> str:
-    text = str(value or "").strip()
+    if type(value) is str and (not value or not (value[0].isspace() or value[-1].isspace())):
+        text = value
+    else:
+        text = str(value or "").strip()
     if len(text) <= limit:
         return text
     return text[: max(1, limit - 3)] + "..."
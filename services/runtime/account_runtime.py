@@ -4,8 +4,11 @@ import asyncio
 import math
 import random
 import time
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any, Awaitable, Callable
 
+from ..domain._common import gather_bounded
 from ..domain.analytics_service import AnalyticsService
 from ..domain.config_data import GameConfigData
 from ..domain.email_service import EmailService
@@ -68,6 +71,12 @@ ORGANIC_FERTILIZER_GOODS_ID = 1002
 
 
 class AccountRuntime:
+    LAND_UPGRADE_CONCURRENCY = 4
+    LAND_OP_DELAY_SEC = 0.2
+
+    # (settings, settings["automation"], 合并结果)：按对象身份判断是否仍有效。
+    _automation_cache: tuple[Any, Any, Mapping[str, Any]] | None = None
+
     def __init__(
         self,
         *,
@@ -230,6 +239,7 @@ class AccountRuntime:
 
     def apply_settings(self, settings: dict[str, Any], revision: int) -> None:
         self.settings = dict(settings)
+        self._automation_cache = None
         self.settings_revision = max(self.settings_revision, _to_int(revision, 0))
         self._daily_routines = self._normalize_daily_routines(self.settings.get("dailyRoutines"))
         self.heartbeat_fail_limit = max(1, _to_int(self.settings.get("heartbeatFailLimit"), self.heartbeat_fail_limit))
@@ -272,7 +282,7 @@ class AccountRuntime:
             "lastExpGain": _to_int(self.last_gain["exp"]),
             "lastGoldGain": _to_int(self.last_gain["gold"]),
             "limits": self.friend.get_operation_limits(),
-            "automation": self._automation(),
+            "automation": dict(self._automation()),
             "preferredSeed": _to_int(self.settings.get("preferredSeedId"), 0),
             "expProgress": exp_progress,
             "configRevision": self.settings_revision,
@@ -312,8 +322,11 @@ class AccountRuntime:
 
     async def do_friend_op(self, friend_gid: int, op_type: str) -> dict[str, Any]:
         result = await self.friend.do_friend_operation(friend_gid, op_type, my_gid=_to_int(self.user_state["gid"]), on_after_steal=self._auto_sell)
+        self._record_friend_result(str(op_type or "").strip().lower(), result)
+        return result
+
+    def _record_friend_result(self, op: str, result: dict[str, Any]) -> None:
         count = _to_int(result.get("count"), 0)
-        op = str(op_type or "").strip().lower()
         if count > 0:
             if op == "steal":
                 self._record("steal", count)
@@ -326,7 +339,6 @@ class AccountRuntime:
             elif op == "bad":
                 self._record("bug", _to_int(result.get("bugCount"), 0))
                 self._record("weed", _to_int(result.get("weedCount"), 0))
-        return result
 
     async def get_seeds(self) -> list[dict[str, Any]]:
         return await self.farm.get_available_seeds(_to_int(self.user_state["level"]))
@@ -1177,22 +1189,44 @@ class AccountRuntime:
     async def _auto_friend_cycle(self) -> None:
         async with self._friend_lock:
             auto = self._automation()
+            steal = auto.get("friend_steal", True)
+            help_ = auto.get("friend_help", True)
+            bad = auto.get("friend_bad", False)
+            # 先汇总每位好友本轮要做的操作，再交给 do_many_friend_operations：每位好友只进出一次农场，
+            # 好友之间按 FriendService 的并发上限并行，而不是逐好友逐操作串行往返。
+            pairs: list[tuple[int, list[str]]] = []
             for row in await self.get_friends():
                 gid = _to_int(row.get("gid"), 0)
                 if gid <= 0:
                     continue
                 plant = row.get("plant", {}) if isinstance(row, dict) else {}
-                if auto.get("friend_steal", True) and _to_int(plant.get("stealNum"), 0) > 0:
-                    await self.do_friend_op(gid, "steal")
-                if auto.get("friend_help", True):
+                ops: list[str] = []
+                if steal and _to_int(plant.get("stealNum"), 0) > 0:
+                    ops.append("steal")
+                if help_:
                     if _to_int(plant.get("dryNum"), 0) > 0:
-                        await self.do_friend_op(gid, "water")
+                        ops.append("water")
                     if _to_int(plant.get("weedNum"), 0) > 0:
-                        await self.do_friend_op(gid, "weed")
+                        ops.append("weed")
                     if _to_int(plant.get("insectNum"), 0) > 0:
-                        await self.do_friend_op(gid, "bug")
-                if auto.get("friend_bad", False):
-                    await self.do_friend_op(gid, "bad")
+                        ops.append("bug")
+                if bad:
+                    ops.append("bad")
+                if ops:
+                    pairs.append((gid, ops))
+            if not pairs:
+                return
+            # 偷菜后的自动出售不在各好友并发分支里触发（会对同一背包重复出售），整轮结束后统一出售一次。
+            rows = await self.friend.do_many_friend_operations(pairs, my_gid=_to_int(self.user_state["gid"]))
+            stolen = 0
+            for row in rows:
+                for result in row.get("results") or []:
+                    op = str(result.get("opType") or "")
+                    self._record_friend_result(op, result)
+                    if op == "steal":
+                        stolen += _to_int(result.get("count"), 0)
+            if stolen > 0:
+                await self._auto_sell()
 
     async def _do_farm_operation(self, op_type: str) -> dict[str, Any]:
         mode = str(op_type or "all").strip().lower()
@@ -1201,7 +1235,7 @@ class AccountRuntime:
         reply = await self.farm.get_all_lands(host_gid=0)
         lands = list(reply.lands or [])
         self.friend.update_operation_limits(list(reply.operation_limits or []))
-        analyzed = self.farm.analyze_lands(lands)
+        analyzed = self.farm.analyze_lands(lands, with_details=False)
         actions: list[str] = []
         gid = _to_int(self.user_state["gid"])
         plant_target_count = 0
@@ -1314,37 +1348,14 @@ class AccountRuntime:
                 plant_skip_reason = str(getattr(self, "_last_plant_skip_reason", "") or "存在可种植地块，但本次未完成种植")
 
         if mode == "upgrade" or (mode == "all" and self._automation().get("land_upgrade", True)):
-            unlocked = 0
-            for land_id in analyzed.unlockable:
-                try:
-                    await self.farm.unlock_land(land_id, False)
-                    unlocked += 1
-                except Exception as e:
-                    self._debug_log(
-                        "farm",
-                        f"unlock failed: {e}",
-                        module="farm",
-                        event="unlock_failed",
-                        landId=land_id,
-                    )
-                await asyncio.sleep(0.2)
+            # 各地块的解锁/升级相互独立：按 LAND_UPGRADE_CONCURRENCY 并发发出，解锁全部完成后再升级。
+            unlocked = await self._gather_land_ops(
+                analyzed.unlockable, lambda land_id: self.farm.unlock_land(land_id, False), "unlock"
+            )
             if unlocked > 0:
                 actions.append(f"解锁{unlocked}")
 
-            upgraded = 0
-            for land_id in analyzed.upgradable:
-                try:
-                    await self.farm.upgrade_land(land_id)
-                    upgraded += 1
-                except Exception as e:
-                    self._debug_log(
-                        "farm",
-                        f"upgrade failed: {e}",
-                        module="farm",
-                        event="upgrade_failed",
-                        landId=land_id,
-                    )
-                await asyncio.sleep(0.2)
+            upgraded = await self._gather_land_ops(analyzed.upgradable, self.farm.upgrade_land, "upgrade")
             if upgraded > 0:
                 self._record("upgrade", upgraded)
                 actions.append(f"升级{upgraded}")
@@ -1896,6 +1907,30 @@ class AccountRuntime:
             )
             return None
 
+    async def _gather_land_ops(
+        self,
+        land_ids: list[int],
+        fn: Callable[[int], Awaitable[Any]],
+        action: str,
+    ) -> int:
+        land_ids = list(land_ids)
+        results = await gather_bounded(
+            land_ids, fn, self.LAND_UPGRADE_CONCURRENCY, delay_sec=self.LAND_OP_DELAY_SEC
+        )
+        ok = 0
+        for land_id, res in zip(land_ids, results):
+            if not isinstance(res, Exception):
+                ok += 1
+                continue
+            self._debug_log(
+                "farm",
+                f"{action} failed: {res}",
+                module="farm",
+                event=f"{action}_failed",
+                landId=land_id,
+            )
+        return ok
+
     async def _auto_sell(self) -> None:
         result = await self.warehouse.sell_all_fruits()
         if _to_int(result.get("soldKinds"), 0) > 0:
@@ -2232,12 +2267,20 @@ class AccountRuntime:
             if gids:
                 await self.friend.accept_friends(gids)
 
-    def _automation(self) -> dict[str, Any]:
-        data = self.settings.get("automation", {}) if isinstance(self.settings, dict) else {}
+    def _automation(self) -> Mapping[str, Any]:
+        # 调度循环/推送回调每次都会读取：设置未替换时直接复用上次合并出的只读视图，
+        # 不再每次复制 DEFAULT_AUTOMATION 再 update。apply_settings 会显式失效该缓存。
+        settings = self.settings
+        data = settings.get("automation", {}) if isinstance(settings, dict) else {}
+        cached = self._automation_cache
+        if cached is not None and cached[0] is settings and cached[1] is data:
+            return cached[2]
         result = dict(DEFAULT_AUTOMATION)
         if isinstance(data, dict):
             result.update(data)
-        return result
+        view = MappingProxyType(result)
+        self._automation_cache = (settings, data, view)
+        return view
 
     def _reset_schedule(self) -> None:
         now = time.time()
@@ -315,6 +315,12 @@ class QFarmRuntimeManager:
                 await self.stop_account(account_id)
             except Exception:
                 continue
+        close_qr = getattr(self.qr_login, "close", None)
+        if callable(close_qr):
+            try:
+                await close_qr()
+            except Exception:
+                pass
         self._persist_runtime_logs(force=True)
 
     async def restart(self) -> None:
@@ -873,7 +879,7 @@ class QFarmRuntimeManager:
                 qr_file.write_bytes(bytes(qrcode_png))
                 payload["qrcode"] = str(qr_file)
             else:
-                payload["qrcode"] = save_qr_png(login_url, self.qr_cache_dir)
+                payload["qrcode"] = save_qr_png(login_url, self.qr_cache_dir, ttl_sec=self.qr_cache_ttl_sec)
         except QRCodeRenderError as e:
             raise RuntimeError(f"本地二维码生成失败: {e}") from e
         except Exception as e:
@@ -32,3 +32,14 @@ def test_config_data_fallbacks_to_any_qqfarm_like_dir_with_game_config(tmp_path:
 
     assert cfg.docs_root == weird
     assert cfg.config_dir == weird / "gameConfig"
+
+
+def test_config_data_builds_level_exp_table_and_skips_invalid_rows(tmp_path: Path):
+    docs = tmp_path / "qqfarm文档"
+    _prepare_game_config(docs)
+    rows = [{"level": 1, "exp": 0}, {"level": "2", "exp": "100"}, {"level": 0, "exp": 5}, {"exp": 9}]
+    (docs / "gameConfig" / "RoleLevel.json").write_bytes(b"\xef\xbb\xbf" + json.dumps(rows).encode("utf-8"))
+
+    cfg = GameConfigData(tmp_path)
+
+    assert cfg.level_exp_table == {1: 0, 2: 100}
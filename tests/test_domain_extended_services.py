@@ -7,9 +7,11 @@ from astrbot_plugin_qfarm.services.domain.mall_service import MallService
 from astrbot_plugin_qfarm.services.domain.monthcard_service import MonthCardService
 from astrbot_plugin_qfarm.services.domain.share_service import ShareService
 from astrbot_plugin_qfarm.services.domain.vip_service import VipService
+from astrbot_plugin_qfarm.services.domain.warehouse_service import WarehouseService
 from astrbot_plugin_qfarm.services.protocol.proto import (
     corepb_pb2,
     emailpb_pb2,
+    itempb_pb2,
     mallpb_pb2,
     qqvippb_pb2,
     sharepb_pb2,
@@ -161,3 +163,94 @@ async def test_share_service_check_report_claim():
     assert report.success is True
     assert claim.has_reward is True
     assert claim.items[0].count == 88
+
+
+class _ItemConfigStub:
+    def __init__(self) -> None:
+        self.item_by_id = {500: {"name": "道具", "type": 2, "price": 9}}
+        self.plant_by_fruit: dict[int, dict] = {}
+        self.plant_by_seed: dict[int, dict] = {}
+        self.lookups = 0
+
+    def get_item_by_id(self, item_id: int):
+        self.lookups += 1
+        return self.item_by_id.get(item_id)
+
+    def get_seed_image(self, item_id: int) -> str:
+        return ""
+
+
+@pytest.mark.asyncio
+async def test_warehouse_bag_detail_caches_item_rows_until_config_reload():
+    bag = itempb_pb2.BagReply(
+        item_bag=corepb_pb2.ItemBag(
+            items=[corepb_pb2.Item(id=500, count=2), corepb_pb2.Item(id=500, count=3)]
+        )
+    )
+    fake = _FakeSession({("gamepb.itempb.ItemService", "Bag"): bag.SerializeToString()})
+    config = _ItemConfigStub()
+    service = WarehouseService(fake, config)
+
+    first = await service.get_bag_detail()
+    second = await service.get_bag_detail()
+    assert first["items"][0]["count"] == 5
+    assert second["items"][0]["count"] == 5
+    assert second["items"][0]["name"] == "道具"
+    assert config.lookups == 1
+
+    config.item_by_id = {500: {"name": "新道具"}}
+    third = await service.get_bag_detail()
+    assert third["items"][0]["name"] == "新道具"
+    assert config.lookups == 2
+
+
+@pytest.mark.asyncio
+async def test_warehouse_sell_fallback_sells_rows_individually():
+    config = _ItemConfigStub()
+    config.plant_by_fruit = {40001: {"id": 1}, 40002: {"id": 2}, 40003: {"id": 3}}
+
+    class _SellSession:
+        def __init__(self) -> None:
+            self.sell_sizes: list[int] = []
+
+        async def call(self, service_name: str, method_name: str, body: bytes, timeout_sec: int = 10) -> bytes:
+            if method_name == "Bag":
+                items = [corepb_pb2.Item(id=40000 + i, count=1, uid=i) for i in (1, 2, 3)]
+                return itempb_pb2.BagReply(item_bag=corepb_pb2.ItemBag(items=items)).SerializeToString()
+            req = itempb_pb2.SellRequest.FromString(body)
+            self.sell_sizes.append(len(req.items))
+            if len(req.items) > 1 or req.items[0].id == 40002:
+                raise RuntimeError("sell rejected")
+            return itempb_pb2.SellReply(get_items=[corepb_pb2.Item(id=1001, count=10)]).SerializeToString()
+
+    session = _SellSession()
+    service = WarehouseService(session, config)
+
+    result = await service.sell_all_fruits()
+
+    assert result == {"soldKinds": 2, "goldEarned": 20}
+    assert sorted(session.sell_sizes) == [1, 1, 1, 3]
+
+
+@pytest.mark.asyncio
+async def test_warehouse_concurrent_bag_reads_share_one_rpc():
+    import asyncio
+
+    class _SlowBagSession:
+        def __init__(self) -> None:
+            self.calls = 0
+
+        async def call(self, service_name: str, method_name: str, body: bytes, timeout_sec: int = 10) -> bytes:
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            return itempb_pb2.BagReply().SerializeToString()
+
+    session = _SlowBagSession()
+    service = WarehouseService(session, _ItemConfigStub())
+
+    first, second = await asyncio.gather(service.get_bag(), service.get_bag())
+    assert session.calls == 1
+    assert first is not second
+
+    await service.get_bag()
+    assert session.calls == 2
@@ -92,3 +92,102 @@ async def test_get_all_tasks_keeps_empty_when_task_info_missing():
     service = TaskService(fake, rpc_timeout_sec=6)
 
     assert await service.get_all_tasks() == {"daily": [], "growth": [], "main": []}
+
+
+@pytest.mark.asyncio
+async def test_put_insects_counts_successes_across_concurrent_lands():
+    from astrbot_plugin_qfarm.services.protocol.proto import plantpb_pb2
+
+    class _PerLandSession:
+        def __init__(self) -> None:
+            self.calls: list[int] = []
+
+        async def call(self, service_name: str, method_name: str, body: bytes, timeout_sec: int = 10) -> bytes:
+            req = plantpb_pb2.PutInsectsRequest()
+            req.ParseFromString(body)
+            land_id = int(req.land_ids[0])
+            self.calls.append(land_id)
+            if land_id == 2:
+                raise RuntimeError("land busy")
+            return plantpb_pb2.PutInsectsReply().SerializeToString()
+
+    session = _PerLandSession()
+    service = FriendService(session, config_data=object(), rpc_timeout_sec=6)
+
+    ok = await service.put_insects(999, [1, 2, 3])
+
+    assert ok == 2
+    assert sorted(session.calls) == [1, 2, 3]
+
+
+def test_operation_limits_reset_only_after_local_midnight(monkeypatch: pytest.MonkeyPatch):
+    from astrbot_plugin_qfarm.services.protocol.proto import plantpb_pb2
+
+    service = FriendService(_FakeSession(), config_data=object(), rpc_timeout_sec=6)
+    base = friend_service_module.time.mktime((2026, 3, 1, 23, 59, 0, 0, 0, -1))
+    clock = {"now": base}
+    monkeypatch.setattr(friend_service_module.time, "time", lambda: clock["now"])
+
+    service.update_operation_limits([plantpb_pb2.OperationLimit(id=10007, day_times=3, day_times_lt=3)])
+    assert service.can_operate(10007) is False
+
+    clock["now"] = base + 30
+    assert service.can_operate(10007) is False
+
+    clock["now"] = base + 90
+    assert service.can_operate(10007) is True
+    assert service.get_operation_limits() == {}
+
+
+@pytest.mark.asyncio
+async def test_check_and_claim_tasks_claims_concurrently_and_skips_failures():
+    def _done_task(task_id: int) -> taskpb_pb2.Task:
+        return taskpb_pb2.Task(id=task_id, progress=1, total_progress=1, is_unlocked=True)
+
+    info = taskpb_pb2.TaskInfoReply(
+        task_info=taskpb_pb2.TaskInfo(daily_tasks=[_done_task(1), _done_task(2)], tasks=[_done_task(3)])
+    )
+
+    class _ClaimSession:
+        def __init__(self) -> None:
+            self.claimed: list[int] = []
+
+        async def call(self, service_name: str, method_name: str, body: bytes, timeout_sec: int = 10) -> bytes:
+            if method_name == "TaskInfo":
+                return info.SerializeToString()
+            req = taskpb_pb2.ClaimTaskRewardRequest.FromString(body)
+            if req.id == 2:
+                raise RuntimeError("already claimed")
+            self.claimed.append(req.id)
+            reply = taskpb_pb2.ClaimTaskRewardReply()
+            reply.items.add(id=1001, count=req.id)
+            return reply.SerializeToString()
+
+    session = _ClaimSession()
+    service = TaskService(session, rpc_timeout_sec=6)
+
+    result = await service.check_and_claim_tasks()
+
+    assert result["taskClaimed"] == 2
+    assert sorted(session.claimed) == [1, 3]
+    assert result["taskItems"] == [{"id": 1001, "count": 1}, {"id": 1001, "count": 3}]
+
+
+def test_format_task_reads_proto_scalars():
+    service = TaskService(_FakeSession(), rpc_timeout_sec=6)
+    task = taskpb_pb2.Task(id=7, progress=3, total_progress=3, is_unlocked=True, share_multiple=2)
+    task.rewards.add(id=1001, count=50)
+
+    row = service.format_task(task)
+
+    assert row == {
+        "id": 7,
+        "desc": "任务#7",
+        "progress": 3,
+        "totalProgress": 3,
+        "isClaimed": False,
+        "isUnlocked": True,
+        "shareMultiple": 2,
+        "rewards": [{"id": 1001, "count": 50}],
+        "canClaim": True,
+    }
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from astrbot_plugin_qfarm.services.domain._common import gather_bounded
+
+
+@pytest.mark.asyncio
+async def test_gather_bounded_limits_concurrency_and_keeps_order():
+    running = 0
+    peak = 0
+
+    async def _work(value: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if value == 2:
+            raise RuntimeError("boom")
+        return value * 10
+
+    results = await gather_bounded(range(5), _work, 2)
+
+    assert peak == 2
+    assert results[:2] == [0, 10]
+    assert isinstance(results[2], RuntimeError)
+    assert results[3:] == [30, 40]
@@ -57,3 +57,25 @@ def test_need_flags_support_phase_time_trigger():
     assert detail["status"] == "growing"
     assert detail["seedId"] == 20001
     assert detail["seedImage"] == "/seed/20001.png"
+
+
+def test_analyze_lands_without_details_keeps_counts():
+    service = FarmService(
+        session=_DummySession(),  # type: ignore[arg-type]
+        config_data=_DummyConfigData(),  # type: ignore[arg-type]
+        analytics=_DummyAnalytics(),  # type: ignore[arg-type]
+        rpc_timeout_sec=10,
+    )
+
+    now = int(time.time())
+    land = plantpb_pb2.LandInfo(id=3, unlocked=True, level=1)
+    land.plant.id = 1020003
+    phase = land.plant.phases.add()
+    phase.phase = plantpb_pb2.MATURE
+    phase.begin_time = now - 10
+    empty_land = plantpb_pb2.LandInfo(id=4, unlocked=True, level=1)
+
+    analyzed = service.analyze_lands([land, empty_land], now_sec=now, with_details=False)
+    assert analyzed.lands_detail == []
+    assert analyzed.harvestable == [3]
+    assert analyzed.empty == [4]
@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from astrbot_plugin_qfarm.services.domain.friend_service import FriendService
+from astrbot_plugin_qfarm.services.protocol.proto import plantpb_pb2, visitpb_pb2
+
+
+class _ConfigStub:
+    def get_plant_name(self, plant_id: int) -> str:
+        return f"plant-{plant_id}"
+
+
+class _VisitSession:
+    def __init__(self, enter: visitpb_pb2.EnterReply, *, deny_ops: set[int] | None = None) -> None:
+        self.enter = enter
+        self.deny_ops = set(deny_ops or set())
+        self.calls: list[str] = []
+
+    async def call(self, service_name: str, method_name: str, body: bytes, timeout_sec: int = 10) -> bytes:
+        _ = (service_name, timeout_sec)
+        self.calls.append(method_name)
+        if method_name == "Enter":
+            return self.enter.SerializeToString()
+        if method_name == "CheckCanOperate":
+            req = plantpb_pb2.CheckCanOperateRequest()
+            req.ParseFromString(body)
+            reply = plantpb_pb2.CheckCanOperateReply(can_operate=req.operation_id not in self.deny_ops)
+            return reply.SerializeToString()
+        return b""
+
+
+def _growing_land(land_id: int, *, dry: bool, weeds: bool) -> plantpb_pb2.LandInfo:
+    land = plantpb_pb2.LandInfo(id=land_id, unlocked=True, level=1)
+    land.plant.id = 1020001
+    phase = land.plant.phases.add()
+    phase.phase = plantpb_pb2.GERMINATION
+    phase.begin_time = int(time.time()) - 60
+    if dry:
+        land.plant.dry_num = 1
+    if weeds:
+        land.plant.weed_owners.append(42)
+    return land
+
+
+@pytest.mark.asyncio
+async def test_do_friend_operations_enters_and_leaves_once():
+    enter = visitpb_pb2.EnterReply()
+    enter.lands.append(_growing_land(1, dry=True, weeds=False))
+    enter.lands.append(_growing_land(2, dry=False, weeds=True))
+    session = _VisitSession(enter, deny_ops={10005})
+    service = FriendService(session, config_data=_ConfigStub(), rpc_timeout_sec=5)  # type: ignore[arg-type]
+
+    results = await service.do_friend_operations(777, ["water", "weed", "bug", "water"], my_gid=1)
+
+    assert [r["opType"] for r in results] == ["water", "weed", "bug"]
+    assert results[0]["count"] == 1
+    assert results[1]["message"] == "今日除草次数已用完"
+    assert results[2]["message"] == "没有可除虫土地"
+    assert session.calls.count("Enter") == 1
+    assert session.calls.count("Leave") == 1
+    assert session.calls.count("CheckCanOperate") == 2
+    assert "WeedOut" not in session.calls
+
+
+@pytest.mark.asyncio
+async def test_do_friend_operations_runs_bad_in_a_fresh_visit_after_removal():
+    crowded = _growing_land(1, dry=False, weeds=True)
+    crowded.plant.weed_owners.append(43)
+    stale = visitpb_pb2.EnterReply()
+    stale.lands.append(crowded)
+    fresh = visitpb_pb2.EnterReply()
+    fresh.lands.append(_growing_land(1, dry=False, weeds=False))
+    session = _VisitSession(stale, deny_ops={10004})
+    service = FriendService(session, config_data=_ConfigStub(), rpc_timeout_sec=5)  # type: ignore[arg-type]
+
+    original_call = session.call
+
+    async def _call(service_name: str, method_name: str, body: bytes, timeout_sec: int = 10) -> bytes:
+        if method_name == "WeedOut":
+            session.enter = fresh
+        return await original_call(service_name, method_name, body, timeout_sec)
+
+    session.call = _call  # type: ignore[method-assign]
+
+    results = await service.do_friend_operations(777, ["bad", "weed"], my_gid=1)
+
+    assert [r["opType"] for r in results] == ["bad", "weed"]
+    assert results[1]["count"] == 1
+    assert results[0]["weedCount"] == 1
+    visits = [call for call in session.calls if call in {"Enter", "Leave"}]
+    assert visits == ["Enter", "Leave", "Enter", "Leave"]
+    assert session.calls.index("WeedOut") < session.calls.index("PutWeeds")
+
+
+@pytest.mark.asyncio
+async def test_do_friend_operations_keeps_one_visit_when_nothing_changed():
+    enter = visitpb_pb2.EnterReply()
+    enter.lands.append(_growing_land(1, dry=False, weeds=False))
+    session = _VisitSession(enter, deny_ops={10003})
+    service = FriendService(session, config_data=_ConfigStub(), rpc_timeout_sec=5)  # type: ignore[arg-type]
+
+    results = await service.do_friend_operations(777, ["water", "bad"], my_gid=1)
+
+    assert results[0]["count"] == 0
+    assert results[1]["bugCount"] == 1
+    assert session.calls.count("Enter") == 1
+    assert session.calls.count("Leave") == 1
+
+
+@pytest.mark.asyncio
+async def test_do_friend_operations_finishes_steal_before_help_ops():
+    enter = visitpb_pb2.EnterReply()
+    mature = plantpb_pb2.LandInfo(id=1, unlocked=True, level=1)
+    mature.plant.id = 1020001
+    mature.plant.stealable = True
+    phase = mature.plant.phases.add()
+    phase.phase = plantpb_pb2.MATURE
+    phase.begin_time = int(time.time()) - 60
+    enter.lands.append(mature)
+    enter.lands.append(_growing_land(2, dry=True, weeds=False))
+    session = _VisitSession(enter)
+    service = FriendService(session, config_data=_ConfigStub(), rpc_timeout_sec=5)  # type: ignore[arg-type]
+
+    async def _after_steal() -> None:
+        session.calls.append("after_steal")
+
+    results = await service.do_friend_operations(777, ["water", "steal"], my_gid=1, on_after_steal=_after_steal)
+
+    assert [r["count"] for r in results] == [1, 1]
+    assert session.calls.index("after_steal") < session.calls.index("WaterLand")
+
+
+@pytest.mark.asyncio
+async def test_leave_failure_keeps_operation_result(monkeypatch: pytest.MonkeyPatch):
+    enter = visitpb_pb2.EnterReply()
+    enter.lands.append(_growing_land(1, dry=True, weeds=False))
+    session = _VisitSession(enter)
+    service = FriendService(session, config_data=_ConfigStub(), rpc_timeout_sec=5)  # type: ignore[arg-type]
+
+    async def _leave(_gid: int) -> None:
+        raise RuntimeError("leave boom")
+
+    monkeypatch.setattr(service, "leave_friend_farm", _leave)
+
+    result = await service.do_friend_operation(777, "water", my_gid=1)
+
+    assert result["ok"] is True
+    assert result["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_do_many_friend_operations_isolates_failures():
+    enter = visitpb_pb2.EnterReply()
+    enter.lands.append(_growing_land(1, dry=True, weeds=False))
+    session = _VisitSession(enter)
+    service = FriendService(session, config_data=_ConfigStub(), rpc_timeout_sec=5)  # type: ignore[arg-type]
+
+    rows = await service.do_many_friend_operations([(11, ["water"]), (0, ["water"]), (12, ["water"])], my_gid=1)
+
+    assert [row["gid"] for row in rows] == [11, 0, 12]
+    assert rows[0]["ok"] is True and rows[0]["results"][0]["count"] == 1
+    assert rows[1]["ok"] is False
+    assert rows[2]["results"][0]["count"] == 1
+    assert session.calls.count("Enter") == 2
+    assert session.calls.count("Leave") == 2
+
+
+@pytest.mark.asyncio
+async def test_do_many_friend_operations_keeps_each_pairs_own_ops():
+    enter = visitpb_pb2.EnterReply()
+    enter.lands.append(_growing_land(1, dry=True, weeds=True))
+    session = _VisitSession(enter)
+    service = FriendService(session, config_data=_ConfigStub(), rpc_timeout_sec=5)  # type: ignore[arg-type]
+
+    rows = await service.do_many_friend_operations([(11, ["water"]), (11, ["weed"])], my_gid=1)
+
+    assert [[r["opType"] for r in row["results"]] for row in rows] == [["water"], ["weed"]]
+    assert session.calls.count("WaterLand") == 1
+    assert session.calls.count("WeedOut") == 1
+
+
+def test_current_phase_val_handles_millisecond_begin_times():
+    now = int(time.time())
+    plant = plantpb_pb2.PlantInfo(id=1)
+    seed = plant.phases.add()
+    seed.phase = plantpb_pb2.SEED
+    seed.begin_time = (now - 600) * 1000
+    mature = plant.phases.add()
+    mature.phase = plantpb_pb2.MATURE
+    mature.begin_time = (now - 10) * 1000
+    future = plant.phases.add()
+    future.phase = plantpb_pb2.DEAD
+    future.begin_time = now + 600
+
+    assert FriendService._current_phase_val(plant, now) == plantpb_pb2.MATURE
+    assert FriendService._current_phase_val(plant, now - 300) == plantpb_pb2.SEED
+    assert FriendService._current_phase_val(plantpb_pb2.PlantInfo(), now) == 0
+
+
+def test_phase_and_op_names_use_indexed_lookup():
+    assert FriendService._phase_name(plantpb_pb2.MATURE) == "成熟"
+    assert FriendService._phase_name(99) == "未知"
+    assert FriendService._op_name(10001) == "收获"
+    assert FriendService._op_name(10008) == "偷菜"
+    assert FriendService._op_name(10009) == "#10009"
+
+
+@pytest.mark.asyncio
+async def test_get_friend_lands_detail_looks_up_plant_meta_once_per_plant():
+    class _CountingConfig:
+        def __init__(self) -> None:
+            self.lookups = 0
+
+        def get_plant_name(self, plant_id: int) -> str:
+            self.lookups += 1
+            return f"plant-{plant_id}"
+
+        def get_seed_id_by_plant(self, plant_id: int) -> int:
+            return plant_id - 1000000
+
+        def get_seed_image(self, seed_id: int) -> str:
+            return f"/seed/{seed_id}.png"
+
+    enter = visitpb_pb2.EnterReply()
+    for land_id in (1, 2, 3):
+        enter.lands.append(_growing_land(land_id, dry=False, weeds=False))
+    config = _CountingConfig()
+    service = FriendService(_VisitSession(enter), config_data=config, rpc_timeout_sec=5)  # type: ignore[arg-type]
+
+    detail = await service.get_friend_lands_detail(777, my_gid=1)
+
+    assert [row["seedId"] for row in detail["lands"]] == [20001, 20001, 20001]
+    assert detail["lands"][0]["seedImage"] == "/seed/20001.png"
+    assert config.lookups == 1
+
+
+@pytest.mark.asyncio
+async def test_get_friend_lands_detail_locked_and_empty_rows_are_independent():
+    enter = visitpb_pb2.EnterReply()
+    enter.lands.append(plantpb_pb2.LandInfo(id=1, unlocked=False, level=0))
+    enter.lands.append(plantpb_pb2.LandInfo(id=2, unlocked=True, level=3))
+    enter.lands.append(plantpb_pb2.LandInfo(id=3, unlocked=True, level=4))
+    service = FriendService(_VisitSession(enter), config_data=_ConfigStub(), rpc_timeout_sec=5)  # type: ignore[arg-type]
+
+    rows = (await service.get_friend_lands_detail(777, my_gid=1))["lands"]
+
+    assert rows[0] == {
+        "id": 1,
+        "unlocked": False,
+        "status": "locked",
+        "plantName": "",
+        "phaseName": "未解锁",
+        "level": 0,
+        "needWater": False,
+        "needWeed": False,
+        "needBug": False,
+    }
+    assert [(r["id"], r["status"], r["level"]) for r in rows[1:]] == [(2, "empty", 3), (3, "empty", 4)]
+    assert list(rows[1]) == list(rows[0])
+
+
+@pytest.mark.asyncio
+async def test_bad_operation_skips_put_when_capability_denied():
+    enter = visitpb_pb2.EnterReply()
+    enter.lands.append(_growing_land(1, dry=False, weeds=False))
+    session = _VisitSession(enter, deny_ops={10003})
+    service = FriendService(session, config_data=_ConfigStub(), rpc_timeout_sec=5)  # type: ignore[arg-type]
+
+    result = await service.do_friend_operation(777, "bad", my_gid=1)
+
+    assert result["bugCount"] == 1
+    assert result["weedCount"] == 0
+    assert session.calls.count("CheckCanOperate") == 2
+    assert "PutInsects" in session.calls
+    assert "PutWeeds" not in session.calls
+
+
+@pytest.mark.asyncio
+async def test_get_friends_list_reuses_result_within_ttl(monkeypatch: pytest.MonkeyPatch):
+    from astrbot_plugin_qfarm.services.domain import friend_service as friend_service_module
+    from astrbot_plugin_qfarm.services.protocol.proto import friendpb_pb2
+
+    class _FriendsSession:
+        def __init__(self) -> None:
+            self.calls: list[str] = []
+
+        async def call(self, service_name: str, method_name: str, body: bytes, timeout_sec: int = 10) -> bytes:
+            _ = (service_name, body, timeout_sec)
+            self.calls.append(method_name)
+            if method_name == "GetAll":
+                reply = friendpb_pb2.GetAllReply()
+                reply.game_friends.add(gid=2, name="B")
+                reply.game_friends.add(gid=3, name="A")
+                return reply.SerializeToString()
+            return b""
+
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(friend_service_module.time, "monotonic", lambda: clock["now"])
+    session = _FriendsSession()
+    service = FriendService(session, config_data=_ConfigStub(), rpc_timeout_sec=5)  # type: ignore[arg-type]
+
+    first = await service.get_friends_list(1)
+    second = await service.get_friends_list(1)
+    assert [row["gid"] for row in first] == [3, 2]
+    assert second == first
+    assert session.calls.count("GetAll") == 1
+
+    first[0]["plant"]["stealNum"] = 99
+    assert (await service.get_friends_list(1))[0]["plant"]["stealNum"] == 0
+    noop = await service.do_friend_operation(777, "water", my_gid=1)
+    assert noop["count"] == 0
+    await service.get_friends_list(1)
+    assert session.calls.count("GetAll") == 1
+
+    await service.accept_friends([4])
+    await service.get_friends_list(1)
+    assert session.calls.count("GetAll") == 2
+
+    clock["now"] += service.FRIENDS_CACHE_TTL_SEC + 1
+    await service.get_friends_list(1)
+    assert session.calls.count("GetAll") == 3
@@ -34,3 +34,66 @@ def test_decode_event_message_roundtrip_ok():
     message = decode_gate_message(raw)
     assert message.meta.service_name == "UserService"
     assert message.meta.method_name == "Ping"
+
+
+def test_codec_reuses_scratch_messages_without_leaking_fields():
+    from astrbot_plugin_qfarm.services.protocol.proto import game_pb2
+
+    failed = game_pb2.Message(
+        meta=game_pb2.Meta(service_name="svc", method_name="Bad", error_code=7, error_message="boom"),
+        body=b"first",
+    ).SerializeToString()
+    first = decode_gate_message(failed)
+    second = decode_gate_message(encode_request("svc", "Ok", b"", client_seq=2, server_seq=3))
+
+    assert (first.meta.error_code, first.meta.error_message, first.body) == (7, "boom", b"first")
+    assert (second.meta.method_name, second.meta.client_seq, second.meta.server_seq) == ("Ok", 2, 3)
+    assert (second.meta.error_code, second.meta.error_message, second.body) == (0, "", b"")
+    assert second.meta.message_type == game_pb2.Request
+
+
+@pytest.mark.parametrize(
+    ("body", "client_seq", "server_seq"),
+    [
+        (b"", 1, 0),
+        (b"payload", 300, 1),
+        (b"x" * 200, 2**40, 2**20),
+        (b"\x00", 0, 0),
+    ],
+)
+def test_encode_request_matches_protobuf_serialization(body: bytes, client_seq: int, server_seq: int):
+    from astrbot_plugin_qfarm.services.protocol.proto import game_pb2
+
+    expected = game_pb2.Message(
+        meta=game_pb2.Meta(
+            service_name="gamepb.plantpb.PlantService",
+            method_name="AllLands",
+            message_type=game_pb2.Request,
+            client_seq=client_seq,
+            server_seq=server_seq,
+        ),
+        body=body,
+    ).SerializeToString()
+
+    got = encode_request(
+        "gamepb.plantpb.PlantService", "AllLands", body, client_seq=client_seq, server_seq=server_seq
+    )
+    assert got == expected
+
+
+def test_decode_gate_frame_matches_full_decode():
+    from astrbot_plugin_qfarm.services.protocol.gate_codec import decode_gate_frame
+    from astrbot_plugin_qfarm.services.protocol.proto import game_pb2
+
+    ok = game_pb2.Message(
+        meta=game_pb2.Meta(service_name="svc", method_name="Ok", message_type=2, client_seq=5, server_seq=9),
+        body=b"reply",
+    ).SerializeToString()
+    failed = game_pb2.Message(
+        meta=game_pb2.Meta(service_name="svc", method_name="Bad", message_type=2, client_seq=6, error_code=7, error_message="boom"),
+    ).SerializeToString()
+
+    assert decode_gate_frame(ok) == (2, 5, 9, 0, "", b"reply")
+    assert decode_gate_frame(failed) == (2, 6, 0, 7, "svc.Bad error=7 boom", b"")
+    with pytest.raises(ValueError):
+        decode_gate_frame(b"\x00\x01")
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+from astrbot_plugin_qfarm.services.image_renderer import QFarmImageRenderer
+
+
+def test_cleanup_cache_removes_only_expired_png(tmp_path: Path):
+    renderer = QFarmImageRenderer("http://127.0.0.1:1", tmp_path / "cache")
+    old_png = renderer.cache_dir / "old.png"
+    new_png = renderer.cache_dir / "new.png"
+    old_txt = renderer.cache_dir / "old.txt"
+    for path in (old_png, new_png, old_txt):
+        path.write_bytes(b"x")
+    stale = time.time() - 7200
+    os.utime(old_png, (stale, stale))
+    os.utime(old_txt, (stale, stale))
+
+    assert renderer.cleanup_cache(max_age_sec=3600) == 1
+    assert not old_png.exists()
+    assert new_png.exists()
+    assert old_txt.exists()
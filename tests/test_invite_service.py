@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 
 import pytest
@@ -87,3 +88,88 @@ async def test_process_invites_calls_report_and_clears_file(tmp_path: Path):
         (2002, "openid-2", 12, "1256"),
     ]
     assert share.read_text(encoding="utf-8") == ""
+
+
+@pytest.mark.asyncio
+async def test_process_invites_reports_concurrently_and_counts_failures(tmp_path: Path):
+    share = tmp_path / "share.txt"
+    share.write_text(
+        "\n".join(f"?uid={3000 + i}&openid=o-{i}&share_source=1" for i in range(4)),
+        encoding="utf-8",
+    )
+
+    class _SlowUserService(_FakeUserService):
+        def __init__(self) -> None:
+            super().__init__()
+            self.active = 0
+            self.peak = 0
+
+        async def report_ark_click(self, sharer_id: int, sharer_open_id: str = "", share_cfg_id: int = 0, scene_id: str = ""):
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(0.01)
+            self.active -= 1
+            if sharer_id == 3002:
+                raise RuntimeError("rejected")
+            return await super().report_ark_click(sharer_id, sharer_open_id, share_cfg_id, scene_id)
+
+    fake = _SlowUserService()
+    service = InviteService(fake, platform="wx", share_file_path=share, concurrency=2)
+    service.REQUEST_DELAY_SEC = 0.0
+
+    result = await service.process_invites()
+
+    assert result["total"] == 4
+    assert result["success"] == 3
+    assert result["failed"] == 1
+    assert fake.peak == 2
+
+
+def test_parse_share_link_matches_query_semantics():
+    row = InviteService.parse_share_link("uid=1&uid=2&openid=a%2Bb+c&extra=x&share_source=")
+    assert row == {"uid": "1", "openid": "a+b c", "share_source": "", "doc_id": ""}
+
+
+@pytest.mark.asyncio
+async def test_report_ark_click_reuses_request_without_leaking_fields():
+    from astrbot_plugin_qfarm.services.domain.user_service import UserService
+    from astrbot_plugin_qfarm.services.protocol.proto import userpb_pb2
+
+    class _Session:
+        def __init__(self) -> None:
+            self.bodies: list[bytes] = []
+
+        async def call(self, service_name: str, method_name: str, body: bytes, timeout_sec: int = 10) -> bytes:
+            self.bodies.append(body)
+            await asyncio.sleep(0)
+            return userpb_pb2.ReportArkClickReply().SerializeToString()
+
+    session = _Session()
+    service = UserService(session)
+
+    await asyncio.gather(
+        service.report_ark_click(sharer_id=1, sharer_open_id="a", share_cfg_id=5, scene_id="1256"),
+        service.report_ark_click(sharer_id=2),
+    )
+
+    first, second = (userpb_pb2.ReportArkClickRequest.FromString(b) for b in session.bodies)
+    assert (first.sharer_id, first.sharer_open_id, first.share_cfg_id, first.scene_id) == (1, "a", 5, "1256")
+    assert (second.sharer_id, second.sharer_open_id, second.share_cfg_id, second.scene_id) == (2, "", 0, "")
+
+
+@pytest.mark.asyncio
+async def test_process_invites_forwards_events_to_log_callback(tmp_path: Path):
+    share = tmp_path / "share.txt"
+    share.write_text("?uid=4001&openid=o&share_source=1", encoding="utf-8")
+    events: list[str] = []
+    service = InviteService(
+        _FakeUserService(),
+        platform="wx",
+        share_file_path=share,
+        log_callback=lambda tag, message, is_warn, meta: events.append(meta.get("event")),
+    )
+    service.REQUEST_DELAY_SEC = 0.0
+
+    await service.process_invites()
+
+    assert events == ["invite_report_ok", "invite_done"]
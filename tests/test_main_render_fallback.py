@@ -88,8 +88,7 @@ async def test_qfarm_entry_fallback_to_text_when_render_payload_is_multi_page(mo
     plugin.image_renderer = SimpleNamespace(render_qfarm=AsyncMock(return_value="/tmp/ok.png"))
     plugin.state_store = SimpleNamespace(get_render_theme=lambda _default="light": "light")
 
-    monkeypatch.setattr(main_module, "should_render_qfarm_image", lambda _text: True)
-    monkeypatch.setattr(main_module, "build_qfarm_payload_pages", lambda _text, theme="light": [{"p": 1}, {"p": 2}])
+    monkeypatch.setattr(main_module, "prepare_qfarm_render", lambda _text, theme="light": (True, [{"p": 1}, {"p": 2}]))
 
     outputs: list[str] = []
     async for item in plugin.qfarm_entry(_DummyEvent()):
@@ -106,8 +105,7 @@ async def test_qfarm_entry_renders_single_page_image(monkeypatch: pytest.MonkeyP
     plugin.image_renderer = SimpleNamespace(render_qfarm=AsyncMock(return_value="/tmp/ok.png"))
     plugin.state_store = SimpleNamespace(get_render_theme=lambda _default="light": "light")
 
-    monkeypatch.setattr(main_module, "should_render_qfarm_image", lambda _text: True)
-    monkeypatch.setattr(main_module, "build_qfarm_payload_pages", lambda _text, theme="light": [{"p": 1}])
+    monkeypatch.setattr(main_module, "prepare_qfarm_render", lambda _text, theme="light": (True, [{"p": 1}]))
 
     outputs: list[str] = []
     async for item in plugin.qfarm_entry(_DummyEvent()):
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import pytest
+
+from astrbot_plugin_qfarm.services.protocol.notify_dispatcher import NotifyDispatcher
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.seen: list[tuple[str, str]] = []
+
+    async def on_notify(self, message_type: str, payload: bytes) -> None:
+        self.seen.append(("method", message_type))
+
+
+@pytest.mark.asyncio
+async def test_off_removes_handlers_and_keeps_registration_order():
+    dispatcher = NotifyDispatcher()
+    recorder = _Recorder()
+    on_notify = recorder.on_notify
+    order: list[str] = []
+
+    await dispatcher.on("LandsNotify", lambda t, p: order.append("first"))
+    await dispatcher.on("LandsNotify", on_notify)
+    await dispatcher.on("*", lambda t, p: order.append("wildcard"))
+    await dispatcher.emit("LandsNotify", b"")
+
+    assert order == ["first", "wildcard"]
+    assert recorder.seen == [("method", "LandsNotify")]
+
+    await dispatcher.off("LandsNotify", on_notify)
+    await dispatcher.emit("LandsNotify", b"")
+    assert recorder.seen == [("method", "LandsNotify")]
+    assert order == ["first", "wildcard", "first", "wildcard"]
+
+
+@pytest.mark.asyncio
+async def test_emit_uses_snapshot_when_handler_unsubscribes_itself():
+    dispatcher = NotifyDispatcher()
+    calls: list[str] = []
+
+    async def once(message_type: str, payload: bytes) -> None:
+        calls.append("once")
+        await dispatcher.off("*", once)
+
+    await dispatcher.on("*", once)
+    await dispatcher.on("*", lambda t, p: calls.append("always"))
+
+    await dispatcher.emit("ItemNotify", b"")
+    await dispatcher.emit("ItemNotify", b"")
+
+    assert calls == ["once", "always", "always"]
+
+    await dispatcher.clear()
+    await dispatcher.emit("ItemNotify", b"")
+    assert calls == ["once", "always", "always"]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_and_unhashable_handlers_keep_list_semantics():
+    dispatcher = NotifyDispatcher()
+    calls: list[str] = []
+
+    class _Unhashable:
+        __hash__ = None  # type: ignore[assignment]
+
+        def __call__(self, message_type: str, payload: bytes) -> None:
+            calls.append("unhashable")
+
+    def twice(message_type: str, payload: bytes) -> None:
+        calls.append("twice")
+
+    await dispatcher.on("LandsNotify", twice)
+    await dispatcher.on("LandsNotify", twice)
+    await dispatcher.on("LandsNotify", _Unhashable())
+    await dispatcher.emit("LandsNotify", b"")
+    assert calls == ["twice", "twice", "unhashable"]
+
+    await dispatcher.off("LandsNotify", twice)
+    await dispatcher.emit("LandsNotify", b"")
+    assert calls == ["twice", "twice", "unhashable", "unhashable"]
@@ -131,3 +131,113 @@ async def test_disconnect_fails_pending_requests():
     assert "websocket disconnected" in str(err)
 
     await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_ws_connect_heartbeat_is_configurable():
+    cfg = GatewaySessionConfig(
+        gateway_ws_url="wss://example.invalid/ws",
+        rpc_timeout_sec=5,
+        ws_heartbeat_sec=12,
+    )
+    session = GatewaySession(cfg)
+    await session.start(code="abc")
+    await asyncio.sleep(0)
+
+    assert _FakeClientSession.connect_kwargs[-1].get("heartbeat") == 12
+
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_written_in_seq_order():
+    from astrbot_plugin_qfarm.services.protocol.gate_codec import decode_gate_message
+    from astrbot_plugin_qfarm.services.protocol.proto import game_pb2
+
+    _FakeClientSession.ws_messages = [_FakeMsg(aiohttp.WSMsgType.TEXT, b"noop")]
+    _FakeClientSession.ws_delay_sec = 5.0
+    session = _build_session()
+    await session.start(code="abc")
+
+    calls = [asyncio.create_task(session.call("svc", f"M{i}", b"", timeout_sec=2)) for i in range(3)]
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    ws = session._ws  # type: ignore[attr-defined]
+    sent = [decode_gate_message(p).meta for p in ws.sent_payloads]
+    assert [(m.method_name, m.client_seq) for m in sent] == [("M0", 1), ("M1", 2), ("M2", 3)]
+
+    for meta in sent:
+        reply = game_pb2.Message(
+            meta=game_pb2.Meta(message_type=2, client_seq=meta.client_seq),
+            body=meta.method_name.encode(),
+        )
+        await session._handle_binary(reply.SerializeToString())  # type: ignore[attr-defined]
+
+    assert await asyncio.gather(*calls) == [b"M0", b"M1", b"M2"]
+    await session.stop()
+
+
+@pytest.mark.asyncio
+async def test_call_timeout_and_cancel_release_pending_slot():
+    _FakeClientSession.ws_messages = [_FakeMsg(aiohttp.WSMsgType.TEXT, b"noop")]
+    _FakeClientSession.ws_delay_sec = 5.0
+    session = _build_session()
+    await session.start(code="abc")
+
+    with pytest.raises(GatewaySessionError, match="request timeout: svc.Slow"):
+        await session.call("svc", "Slow", b"", timeout_sec=1)
+    assert session._pending == {}  # type: ignore[attr-defined]
+    assert session._timeout_buckets == {}  # type: ignore[attr-defined]
+
+    task = asyncio.create_task(session.call("svc", "Cancelled", b"", timeout_sec=5))
+    await asyncio.sleep(0)
+    assert len(session._pending) == 1  # type: ignore[attr-defined]
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert session._pending == {}  # type: ignore[attr-defined]
+    await session.stop()
+    assert session._sweep_task is None  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_stop_fails_inflight_calls_and_refuses_new_calls():
+    _FakeClientSession.ws_messages = [_FakeMsg(aiohttp.WSMsgType.TEXT, b"noop")]
+    _FakeClientSession.ws_delay_sec = 5.0
+    session = _build_session()
+    await session.start(code="abc")
+
+    task = asyncio.create_task(session.call("svc", "InFlight", b"", timeout_sec=5))
+    await asyncio.sleep(0)
+    assert list(session._timeout_buckets.values()) == [[1]]  # type: ignore[attr-defined]
+
+    await session.stop()
+    with pytest.raises(GatewaySessionError):
+        await task
+    assert session._timeout_buckets == {}  # type: ignore[attr-defined]
+
+    session._closed = True  # type: ignore[attr-defined]
+    session._ws = _FakeWS([])  # type: ignore[attr-defined]
+    with pytest.raises(GatewaySessionError, match="not connected"):
+        await session.call("svc", "Late", b"")
+
+
+def test_tune_socket_sets_nodelay_and_keepalive():
+    import socket
+
+    class _WS:
+        def __init__(self, sock) -> None:
+            self.sock = sock
+
+        def get_extra_info(self, name: str, default=None):
+            return self.sock if name == "socket" else default
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        session_module._tune_socket(_WS(sock))
+        assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY) != 0
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE) != 0
+    finally:
+        sock.close()
+    session_module._tune_socket(_WS(None))
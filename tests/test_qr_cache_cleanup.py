@@ -47,3 +47,23 @@ async def test_qr_cache_cleanup_removes_expired_and_keeps_current(tmp_path: Path
     assert second_path.exists()
     assert first_path.read_bytes().startswith(b"\x89PNG\r\n\x1a\n")
     assert second_path.read_bytes().startswith(b"\x89PNG\r\n\x1a\n")
+
+
+def test_save_qr_png_reuses_file_for_same_content_within_ttl(tmp_path: Path):
+    from astrbot_plugin_qfarm.services.qr_code_renderer import save_qr_png
+
+    url = "https://h5.qzone.qq.com/qqq/code/reuse?_proxy=1&from=ide"
+    first = Path(save_qr_png(url, tmp_path, ttl_sec=600))
+    mtime = first.stat().st_mtime_ns
+    second = Path(save_qr_png(url, tmp_path, ttl_sec=600))
+    other = Path(save_qr_png(url + "&x=1", tmp_path, ttl_sec=600))
+
+    assert second == first
+    assert first.stat().st_mtime_ns == mtime
+    assert other != first
+
+    old_ts = time.time() - 1200
+    os.utime(first, (old_ts, old_ts))
+    third = Path(save_qr_png(url, tmp_path, ttl_sec=600))
+    assert third == first
+    assert first.stat().st_mtime > old_ts
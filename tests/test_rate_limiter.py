@@ -47,3 +47,43 @@ async def test_account_write_serialized():
     await asyncio.wait_for(task, timeout=1.0)
     assert acquired_second is True
 
+
+
+@pytest.mark.asyncio
+async def test_uncontended_acquire_completes_without_suspending():
+    limiter = RateLimiter(read_cooldown_sec=0.0, write_cooldown_sec=0.0, global_concurrency=2)
+    coro = limiter.acquire("u1", is_write=True, account_id="acc-1")
+    with pytest.raises(StopIteration) as done:
+        coro.send(None)
+    lease = done.value.value
+    lease.release()
+
+
+@pytest.mark.asyncio
+async def test_cooldown_tracking_drops_expired_users_when_over_cap():
+    limiter = RateLimiter(read_cooldown_sec=0.0, write_cooldown_sec=5.0, global_concurrency=10)
+    limiter.MAX_TRACKED_USERS = 3
+    for uid in ("a", "b", "c"):
+        (await limiter.acquire(uid, is_write=False)).release()
+    (await limiter.acquire("w", is_write=True)).release()
+    (await limiter.acquire("d", is_write=False)).release()
+
+    assert len(limiter._next_read_ts) <= 3
+    with pytest.raises(RateLimitError):
+        await limiter.acquire("w", is_write=True)
+
+
+@pytest.mark.asyncio
+async def test_cooldown_prune_is_amortized_when_all_users_are_live():
+    limiter = RateLimiter(read_cooldown_sec=60.0, write_cooldown_sec=60.0, global_concurrency=10)
+    limiter.MAX_TRACKED_USERS = 3
+    for uid in ("a", "b", "c", "d"):
+        (await limiter.acquire(uid, is_write=False)).release()
+    pruned = limiter._next_read_ts
+    assert len(pruned) == 4
+
+    for uid in ("e", "f", "g", "h"):
+        (await limiter.acquire(uid, is_write=False)).release()
+    assert limiter._next_read_ts is pruned
+    with pytest.raises(RateLimitError):
+        await limiter.acquire("a", is_write=False)
@@ -51,3 +51,113 @@ def test_should_render_qfarm_image_text_only_cases():
     assert should_render_qfarm_image("用法: qfarm 状态") is False
     assert should_render_qfarm_image("操作失败: 账号未运行\n建议: qfarm 账号 启动") is False
     assert should_render_qfarm_image("【农场状态】\n金币: 1000") is True
+
+
+def test_numbered_first_line_is_not_used_as_summary():
+    pages = build_qfarm_payload_pages("【列表】\n12. 第一项\n13. 第二项")
+    assert pages[0]["summary"] == ""
+    assert [row["value"] for row in pages[0]["sections"][0]["rows"]] == ["12. 第一项", "13. 第二项"]
+
+    pages = build_qfarm_payload_pages("【列表】\n12 项已完成\n- 第一项")
+    assert pages[0]["summary"] == "12 项已完成"
+
+
+def test_build_payload_subtitle_is_local_timestamp():
+    import datetime as dt
+
+    before = dt.datetime.now().replace(microsecond=0)
+    subtitle = build_qfarm_payload_pages("hello")[0]["subtitle"]
+    after = dt.datetime.now()
+    assert before <= dt.datetime.strptime(subtitle, "%Y-%m-%d %H:%M:%S") <= after
+
+
+def test_prepare_qfarm_render_matches_separate_calls():
+    from astrbot_plugin_qfarm.services.render_payload_builder import prepare_qfarm_render
+
+    assert prepare_qfarm_render("用法: qfarm 状态") == (False, [])
+    assert prepare_qfarm_render("   ") == (False, [])
+
+    text = "\n  【农场状态】\n金币: 1000\n- 田地A 已成熟\n\n"
+    should_render, pages = prepare_qfarm_render(text, theme="dark")
+    expected = build_qfarm_payload_pages(text, theme="dark")
+    assert should_render is True
+    assert [{**p, "subtitle": ""} for p in pages] == [{**p, "subtitle": ""} for p in expected]
+
+
+def test_build_payload_strips_nul_and_clips_long_lines():
+    pages = build_qfarm_payload_pages("【标\x00题】\n\x00\n" + "x" * 130)
+    assert pages[0]["title"] == "标题"
+    assert pages[0]["summary"] == "x" * 117 + "..."
+
+
+def test_build_payload_splits_full_width_colon_first():
+    pages = build_qfarm_payload_pages("【状态】\n摘要\n时间：12:30\n备注 无分隔")
+    assert pages[0]["stats"] == [{"label": "时间", "value": "12:30"}]
+    assert pages[0]["sections"][0]["rows"] == [{"value": "备注 无分隔"}]
+
+
+def test_build_payload_page_key_order_is_stable():
+    pages = build_qfarm_payload_pages("【状态】\n" + "\n".join(f"- row {i}" for i in range(30)))
+    expected = ["title", "subtitle", "icon", "theme", "summary", "stats", "sections", "page", "footer"]
+    assert all(list(page) == expected for page in pages)
+
+
+def test_single_line_fast_path_matches_full_layout():
+    from astrbot_plugin_qfarm.services import render_payload_builder as builder
+
+    samples = ["  已收获 3 块地  ", "金币: 1000", "- 一项", "3. 第三项", "【标题】", "tab\tline", "x" * 119]
+    for text in samples:
+        fast = builder.build_qfarm_payload_pages(text)
+        full = builder._format_pages(*builder._layout_rows(text), theme="light", icon="🌾", footer="astrbot_plugin_qfarm")
+        assert [{**p, "subtitle": ""} for p in fast] == [{**p, "subtitle": ""} for p in full], text
+
+
+def test_split_key_value_only_strips_list_marker():
+    pages = build_qfarm_payload_pages("【状态】\n摘要\n- 金币: 10\n-5: 负数")
+    assert pages[0]["stats"] == [{"label": "金币", "value": "10"}, {"label": "-5", "value": "负数"}]
+
+
+def test_build_payload_normalizes_theme():
+    assert build_qfarm_payload_pages("x", theme="dark")[0]["theme"] == "dark"
+    assert build_qfarm_payload_pages("x", theme=" DARK ")[0]["theme"] == "dark"
+    assert build_qfarm_payload_pages("x", theme="neon")[0]["theme"] == "light"
+    assert build_qfarm_payload_pages("x", theme=None)[0]["theme"] == "light"
+
+
+def test_clip_line_strips_unicode_whitespace_and_clips():
+    from astrbot_plugin_qfarm.services.render_payload_builder import _clip_line
+
+    assert _clip_line("　值 ") == "值"
+    assert _clip_line("abcdef", 5) == "ab..."
+    assert _clip_line(None) == ""
+    assert _clip_line(12) == "12"
+
+
+def test_repeated_text_reuses_layout_but_returns_fresh_pages():
+    from astrbot_plugin_qfarm.services.render_payload_builder import _layout_rows
+
+    text = "【农场状态】\n摘要\n金币: 1000\n" + "\n".join(f"- row {i}" for i in range(30))
+    _layout_rows.cache_clear()
+    first = build_qfarm_payload_pages(text, theme="dark")
+    second = build_qfarm_payload_pages(text, theme="light")
+
+    assert _layout_rows.cache_info().hits == 1
+    assert [p["theme"] for p in first + second] == ["dark", "dark", "light", "light"]
+    assert first[0]["stats"] == second[0]["stats"]
+    assert first[0]["stats"] is not second[0]["stats"]
+    assert first[0]["sections"][0]["rows"] is not second[0]["sections"][0]["rows"]
+
+    first[0]["stats"][0]["value"] = "changed"
+    first[0]["sections"][0]["rows"][0]["value"] = "changed"
+    third = build_qfarm_payload_pages(text)
+    assert third[0]["stats"] == [{"label": "金币", "value": "1000"}]
+    assert third[0]["sections"][0]["rows"][0] == {"value": "- row 0"}
+
+
+def test_build_payload_empty_text_uses_placeholder_page():
+    pages = build_qfarm_payload_pages(" \n\x00\n ")
+    assert len(pages) == 1
+    page = pages[0]
+    assert (page["title"], page["summary"], page["stats"]) == ("QFarm 结果", "暂无可展示内容。", [])
+    assert page["sections"] == [{"title": "详情", "rows": [{"value": "暂无可展示内容。"}]}]
+    assert page["page"] == {"index": 1, "total": 1}
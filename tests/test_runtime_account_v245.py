@@ -192,3 +192,60 @@ def test_classify_login_error_handles_chinese_auth_400():
     code = AccountRuntime._classify_login_error(error_text)
     assert code == "ws_auth_400"
     assert AccountRuntime._should_rebind_after_login_error(code) is True
+
+
+def test_automation_view_is_cached_until_settings_change():
+    runtime = AccountRuntime.__new__(AccountRuntime)
+    runtime.settings = {"automation": {"sell": False}}
+
+    first = runtime._automation()
+    assert first["sell"] is False
+    assert first["farm"] is account_runtime_module.DEFAULT_AUTOMATION["farm"]
+    assert runtime._automation() is first
+    with pytest.raises(TypeError):
+        first["sell"] = True  # type: ignore[index]
+
+    runtime.settings = {"automation": {"sell": True}}
+    assert runtime._automation()["sell"] is True
+
+    runtime.settings = {}
+    assert dict(runtime._automation()) == account_runtime_module.DEFAULT_AUTOMATION
+
+
+@pytest.mark.asyncio
+async def test_auto_friend_cycle_batches_ops_per_friend_and_sells_once():
+    import asyncio
+
+    class _Friend:
+        def __init__(self) -> None:
+            self.pairs: list[tuple[int, list[str]]] = []
+
+        async def get_friends_list(self, my_gid: int) -> list[dict[str, object]]:
+            return [
+                {"gid": 11, "plant": {"stealNum": 2, "dryNum": 1}},
+                {"gid": 12, "plant": {"weedNum": 1, "insectNum": 1}},
+                {"gid": 13, "plant": {}},
+                {"gid": 0, "plant": {"stealNum": 5}},
+            ]
+
+        async def do_many_friend_operations(self, pairs, *, my_gid: int, on_after_steal=None):
+            self.pairs = list(pairs)
+            assert on_after_steal is None
+            return [
+                {"gid": gid, "ok": True, "results": [{"ok": True, "opType": op, "count": 1} for op in ops]}
+                for gid, ops in pairs
+            ]
+
+    runtime = AccountRuntime.__new__(AccountRuntime)
+    runtime._friend_lock = asyncio.Lock()
+    runtime.settings = {"automation": {"friend_steal": True, "friend_help": True, "friend_bad": False}}
+    runtime.user_state = {"gid": 1}
+    runtime.operations = {}
+    runtime.friend = _Friend()
+    runtime._auto_sell = AsyncMock()
+
+    await runtime._auto_friend_cycle()
+
+    assert runtime.friend.pairs == [(11, ["steal", "water"]), (12, ["weed", "bug"])]
+    assert runtime.operations == {"steal": 1, "helpWater": 1, "helpWeed": 1, "helpBug": 1}
+    runtime._auto_sell.assert_awaited_once()
@@ -18,8 +18,8 @@ class _FakeFarm:
         _ = host_gid
         return SimpleNamespace(lands=[], operation_limits=[])
 
-    def analyze_lands(self, lands):
-        _ = lands
+    def analyze_lands(self, lands, **kwargs):
+        _ = (lands, kwargs)
         return LandAnalyzeResult(
             harvestable=[1, 2],
             growing=[],
@@ -103,8 +103,8 @@ async def test_do_farm_operation_all_continues_when_clear_step_failed():
             _ = (land_ids, gid)
             raise RuntimeError("weed failed")
 
-        def analyze_lands(self, lands):
-            _ = lands
+        def analyze_lands(self, lands, **kwargs):
+            _ = (lands, kwargs)
             return LandAnalyzeResult(
                 harvestable=[5],
                 growing=[],
@@ -142,8 +142,8 @@ async def test_do_farm_operation_all_continues_when_clear_step_failed():
 @pytest.mark.asyncio
 async def test_do_farm_operation_all_includes_unlock_before_upgrade():
     class _FarmUnlockable(_FakeFarm):
-        def analyze_lands(self, lands):
-            _ = lands
+        def analyze_lands(self, lands, **kwargs):
+            _ = (lands, kwargs)
             return LandAnalyzeResult(
                 harvestable=[],
                 growing=[],
@@ -341,3 +341,30 @@ async def test_auto_plant_caps_buy_count_by_seed_stock_and_gold():
     runtime.farm.buy_goods.assert_awaited_once_with(5566, 1, 100)
     runtime.farm.plant.assert_awaited_once_with(30001, [11, 12])
     assert runtime.operations.get("plant") == 2
+
+
+@pytest.mark.asyncio
+async def test_gather_land_ops_runs_concurrently_and_counts_failures():
+    import asyncio
+
+    runtime = AccountRuntime.__new__(AccountRuntime)
+    runtime.LAND_OP_DELAY_SEC = 0.0
+    logged: list[dict] = []
+    runtime._debug_log = lambda *args, **kwargs: logged.append(kwargs)
+    active = 0
+    peak = 0
+
+    async def _upgrade(land_id: int) -> None:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        if land_id == 3:
+            raise RuntimeError("denied")
+
+    count = await runtime._gather_land_ops([1, 2, 3, 4, 5, 6], _upgrade, "upgrade")
+
+    assert count == 5
+    assert peak == runtime.LAND_UPGRADE_CONCURRENCY
+    assert [(row["event"], row["landId"]) for row in logged] == [("upgrade_failed", 3)]
@@ -35,3 +35,45 @@ async def test_qr_create_generates_local_png(tmp_path: Path):
     assert qr_path.read_bytes().startswith(b"\x89PNG\r\n\x1a\n")
     assert "api.qrserver.com" not in str(data.get("qrcode") or "")
     assert data.get("code") == "bind-code-1"
+
+
+def _png_pixels(payload: bytes) -> tuple[bytes, list[bytes]]:
+    import struct
+    import zlib
+
+    pos, header, idat = 8, b"", b""
+    while pos < len(payload):
+        (length,) = struct.unpack(">I", payload[pos : pos + 4])
+        kind = payload[pos + 4 : pos + 8]
+        data = payload[pos + 8 : pos + 8 + length]
+        if kind == b"IHDR":
+            header = data
+        elif kind == b"IDAT":
+            idat += data
+        pos += 12 + length
+    width = struct.unpack(">I", header[:4])[0]
+    stride = (width + 7) // 8 + 1
+    raw = zlib.decompress(idat)
+    rows: list[bytes] = []
+    prev = bytes(stride - 1)
+    for i in range(0, len(raw), stride):
+        kind, line = raw[i], raw[i + 1 : i + stride]
+        assert kind in (0, 2)
+        # segno 对重复行使用 Up 过滤（filter 2）
+        prev = bytes((a + b) & 0xFF for a, b in zip(line, prev)) if kind == 2 else line
+        rows.append(prev)
+    return header, rows
+
+
+@pytest.mark.parametrize("text", ["x", "https://h5.qzone.qq.com/qqq/code/bind-code-1?_proxy=1&from=ide", "q" * 300])
+def test_render_png_bytes_matches_segno_pixels(text: str):
+    import io
+
+    import segno
+
+    from astrbot_plugin_qfarm.services.qr_code_renderer import render_png_bytes
+
+    buffer = io.BytesIO()
+    segno.make(text, error="m").save(buffer, kind="png", scale=8, border=2, dark="#000000", light="#ffffff")
+
+    assert _png_pixels(render_png_bytes(text)) == _png_pixels(buffer.getvalue())
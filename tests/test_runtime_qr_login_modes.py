@@ -140,3 +140,47 @@ async def test_runtime_qr_login_legacy_interface_still_works(tmp_path: Path):
     result = await manager.qr_check("legacy-code", mode="pc", poll_timeout=5, auto_retry=True, retry_backoff=0.2)
     assert result.get("status") == "Wait"
     assert legacy.check_codes == ["legacy-code"]
+
+
+@pytest.mark.asyncio
+async def test_qr_login_polls_reuse_one_http_session(monkeypatch: pytest.MonkeyPatch):
+    from astrbot_plugin_qfarm.services import qr_login as qr_login_module
+
+    class _FakeResp:
+        status = 200
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def read(self) -> bytes:
+            return b'{"code": 0, "data": {"ok": 0}}'
+
+    class _FakeHttpSession:
+        created = 0
+
+        def __init__(self, **kwargs) -> None:
+            _FakeHttpSession.created += 1
+            self.closed = False
+            self.request_headers: list[dict[str, str]] = []
+
+        def get(self, url: str, headers=None):
+            self.request_headers.append(dict(headers or {}))
+            return _FakeResp()
+
+        async def close(self) -> None:
+            self.closed = True
+
+    monkeypatch.setattr(qr_login_module.aiohttp, "ClientSession", _FakeHttpSession)
+    login = qr_login_module.QFarmQRLogin()
+
+    assert (await login.query_status("abc"))["status"] == "Wait"
+    assert (await login.query_status("abc"))["status"] == "Wait"
+    session = login._session
+    assert _FakeHttpSession.created == 1
+    assert all(h.get("host") == "q.qq.com" for h in session.request_headers)
+
+    await login.close()
+    assert session.closed is True